@@ -0,0 +1,129 @@
+# ============================================================
+# Letter / position inverted index for history replay
+# ============================================================
+#
+# Every (position, letter) and (letter, minimum count) pair maps to the
+# set of words having it, stored as a bitmask (a Python int, bit i for
+# word i). One turn of feedback becomes a handful of mask intersections:
+#
+#   G at p      word has the letter at p
+#   Y or B at p word does not have the letter at p
+#   per letter  m = its G + Y count in the guess: the word has at least
+#               m of it, exactly m if the guess also got a B for it
+#
+# which is exactly the set of targets giving that feedback, provided
+# the feedback is one the scoring can produce (a letter's yellows come
+# before its blacks); anything else matches no word.
+
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+
+def valid_step(guess, fb):
+    """a 5-letter guess and 5 letters of G, Y or B feedback"""
+    return (
+        isinstance(guess, str) and isinstance(fb, str)
+        and len(guess) == 5 and len(fb) == 5 and not set(fb) - set("GYB")
+    )
+
+
+def parse_history(text):
+    """'abode:BGYBB,cairn:GGBBY' -> [('abode', 'BGYBB'), ('cairn', 'GGBBY')]"""
+    history = []
+    for step in text.split(","):
+        guess, _, fb = step.strip().partition(":")
+        if not valid_step(guess, fb):
+            raise ValueError(f"bad history step {step!r}, expected guess:GYBBB")
+        history.append((guess, fb))
+    return history
+
+
+def _to_mask(bits):
+    """packed little-endian bytes -> int with the same bits"""
+    return int.from_bytes(bits.tobytes(), "little")
+
+
+class ConstraintIndex:
+    def __init__(self, size, at_bits, at_least_bits):
+        """
+        at_bits      : (5, 26, ceil(size / 8)) uint8, packed masks of
+                       the words with each letter at each position
+        at_least_bits: (26, 5, ceil(size / 8)) uint8, packed masks of
+                       the words with at least 1..5 of each letter
+        """
+        self.size = size
+        self.at_bits = at_bits
+        self.at_least_bits = at_least_bits
+        self.all = (1 << size) - 1
+
+        # at[p][letter]: words with letter at position p
+        self.at = [
+            {ch: _to_mask(at_bits[p, i]) for i, ch in enumerate(ALPHABET)}
+            for p in range(5)
+        ]
+        # at_least[letter][k]: words with at least k of letter, k = 0..6
+        self.at_least = {
+            ch: [self.all] + [_to_mask(b) for b in at_least_bits[i]] + [0]
+            for i, ch in enumerate(ALPHABET)
+        }
+
+    @classmethod
+    def for_words(cls, words):
+        letters = np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8)
+        letters = letters.reshape(len(words), 5)
+        hit = letters[None, :, :] == np.frombuffer(ALPHABET.encode(), dtype=np.uint8)[:, None, None]
+        counts = hit.sum(axis=2)
+        # (5, 26, n) and (26, 5, n) flags, packed along the words
+        at = hit.transpose(2, 0, 1)
+        at_least = counts[:, None, :] >= np.arange(1, 6)[None, :, None]
+        return cls(
+            len(words),
+            np.packbits(at, axis=2, bitorder="little"),
+            np.packbits(at_least, axis=2, bitorder="little"),
+        )
+
+    def mask_for(self, guess, fb):
+        """words that give feedback fb to guess"""
+        mask = self.all
+        seen = {}
+        for p, (ch, f) in enumerate(zip(guess, fb)):
+            if ch not in self.at_least:
+                return 0
+            counts = seen.setdefault(ch, [0, False])
+            if f == "G":
+                mask &= self.at[p][ch]
+                counts[0] += 1
+                continue
+
+            mask &= self.all ^ self.at[p][ch]
+            if f == "Y":
+                if counts[1]:
+                    # a yellow after a black of the same letter
+                    return 0
+                counts[0] += 1
+            else:
+                counts[1] = True
+
+        for ch, (m, exact) in seen.items():
+            at_least = self.at_least[ch]
+            mask &= at_least[m]
+            if exact:
+                mask &= self.all ^ at_least[m + 1]
+        return mask
+
+    def filter(self, history, mask=None):
+        """positions of the words consistent with every turn of history"""
+        mask = self.all if mask is None else mask
+        for guess, fb in history:
+            mask &= self.mask_for(guess, fb)
+            if not mask:
+                break
+        return self.positions(mask)
+
+    def positions(self, mask):
+        raw = np.frombuffer(mask.to_bytes((self.size + 7) // 8, "little"), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(raw, count=self.size, bitorder="little"))
@@ -0,0 +1,514 @@
+# ============================================================
+# Precomputed guess x target feedback matrix
+# ============================================================
+#
+# Every (guess, target) pattern is computed once for a whole word list
+# and stored as a uint8 base-3 code (0..242). The matrix is cached on
+# disk as an .npy file keyed by a hash of the word list and memory-mapped
+# on load, so repeated runs skip the computation entirely. Lists of
+# LAZY_MIN_WORDS or more get FeedbackRows instead, which computes rows
+# as they are used and keeps a bounded number of them.
+#
+# Digit values follow the string order of the pattern letters
+# (B=0, G=1, Y=2) with the first letter most significant, so sorting
+# codes gives the same order as sorting the 'GYB' strings.
+
+import hashlib
+import os
+from collections import OrderedDict
+
+from file_io import atomic_write
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+
+PATTERN_COUNT = 243
+PATTERN_DIGITS = "BGY"
+ALL_GREEN = 121  # pattern_code("GGGGG")
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".wordle_cache")
+
+# number of guess rows computed per vectorized block
+BLOCK_ROWS = 256
+
+# word lists at least this long get feedback rows on demand
+# (FeedbackRows) instead of a whole N x N matrix
+LAZY_MIN_WORDS = 8192
+# default memory budget of FeedbackRows' row cache
+ROW_CACHE_BYTES = 64 << 20
+# state keys, strategy trees and _min_depth store positions as uint16
+MAX_WORDS = 1 << 16
+
+
+def pattern_code(pattern):
+    code = 0
+    for ch in pattern:
+        code = code * 3 + PATTERN_DIGITS.index(ch)
+    return code
+
+
+def pattern_string(code):
+    res = []
+    for _ in range(5):
+        code, digit = divmod(code, 3)
+        res.append(PATTERN_DIGITS[digit])
+    return ''.join(reversed(res))
+
+
+PATTERN_STRINGS = tuple(pattern_string(c) for c in range(PATTERN_COUNT))
+
+# codes of the patterns with exactly one black and no yellow
+RISKY_PATTERNS = [
+    code for code, p in enumerate(PATTERN_STRINGS)
+    if p.count('B') == 1 and p.count('Y') == 0
+]
+
+
+def check_word_count(words):
+    if len(words) > MAX_WORDS:
+        raise ValueError(
+            f"word list has {len(words)} words; positions are 16-bit,"
+            f" at most {MAX_WORDS} are supported"
+        )
+
+
+def word_list_hash(words):
+    h = hashlib.sha1()
+    for w in words:
+        h.update(w.encode("ascii"))
+        h.update(b"\n")
+    return h.hexdigest()[:16]
+
+
+def encode_words(words):
+    """Letters of each word as an (N, 5) uint8 array."""
+    if not words:
+        return np.zeros((0, 5), dtype=np.uint8)
+    buf = "".join(words).encode("ascii")
+    return np.frombuffer(buf, dtype=np.uint8).reshape(len(words), 5)
+
+
+# ------------------------------------------------------------
+# Vectorized feedback computation
+# ------------------------------------------------------------
+
+def feedback_codes(guess_letters, target_letters):
+    """
+    guess_letters  : (G, 5) uint8 array
+    target_letters : (T, 5) uint8 array
+
+    returns: (G, T) uint8 array of pattern codes
+    """
+    g = guess_letters[:, None, :]
+    t = target_letters[None, :, :]
+    green = g == t
+    codes = np.zeros((len(guess_letters), len(target_letters)), dtype=np.uint8)
+
+    for i in range(5):
+        # target letters not matched by a green, equal to guess letter i
+        avail = np.zeros(codes.shape, dtype=np.int8)
+        for k in range(5):
+            avail += (g[:, :, i] == t[:, :, k]) & ~green[:, :, k]
+
+        # minus the ones already used up by earlier yellows
+        for j in range(i):
+            same = (guess_letters[:, j] == guess_letters[:, i])[:, None]
+            avail -= same & ~green[:, :, j]
+
+        yellow = ~green[:, :, i] & (avail > 0)
+        codes *= 3
+        codes += green[:, :, i]
+        codes += yellow * np.uint8(2)
+
+    return codes
+
+
+def compute_feedback_matrix(words, guesses=None):
+    targets = encode_words(words)
+    guess_letters = targets if guesses is None else encode_words(guesses)
+    return compute_rows(guess_letters, targets)
+
+
+# ------------------------------------------------------------
+# Batched bucket statistics for many guesses at once
+# ------------------------------------------------------------
+
+def bucket_counts(rows):
+    """(G, n) block of codes -> (G, 243) bucket sizes"""
+    g, n = rows.shape
+    offsets = np.arange(g, dtype=np.int32)[:, None] * PATTERN_COUNT
+    # memory order is fine for counting and avoids a copy when rows
+    # came out of a column gather in Fortran order
+    flat = (rows + offsets).ravel(order="K")
+    return np.bincount(flat, minlength=g * PATTERN_COUNT).reshape(g, PATTERN_COUNT)
+
+
+def guess_stats(matrix, guesses, candidates, risky_limit=5):
+    """
+    matrix     : feedback matrix (guess rows x target columns), or
+                 FeedbackRows for one
+    guesses    : row positions of the guesses to score
+    candidates : boolean mask or positions of the remaining targets
+    risky_limit: largest allowed bucket among RISKY_PATTERNS
+
+    returns: (entropy, max_bucket, risky) arrays, one entry per guess
+    """
+    guesses = np.asarray(guesses, dtype=np.intp)
+    cols = np.asarray(candidates)
+    if cols.dtype == bool:
+        cols = np.flatnonzero(cols)
+    n = len(cols)
+
+    entropy = np.zeros(len(guesses))
+    max_bucket = np.zeros(len(guesses), dtype=np.intp)
+    risky = np.zeros(len(guesses), dtype=bool)
+    if n == 0:
+        return entropy, max_bucket, risky
+
+    # -p * log2(p) for every possible bucket size
+    p = np.arange(n + 1) / n
+    plogp = np.zeros(n + 1)
+    plogp[1:] = -p[1:] * np.log2(p[1:])
+
+    for start in range(0, len(guesses), BLOCK_ROWS):
+        stop = start + BLOCK_ROWS
+        if isinstance(matrix, FeedbackRows):
+            # only the candidate columns of rows it has not cached
+            block = matrix[guesses[start:stop], cols]
+        else:
+            # rows first, then columns: much cheaper than a 2-D fancy index
+            block = matrix[guesses[start:stop]][:, cols]
+        counts = bucket_counts(block)
+
+        # sum in sorted order so equal partitions get bit-identical entropy
+        entropy[start:stop] = np.sort(plogp[counts], axis=1).sum(axis=1)
+        max_bucket[start:stop] = counts.max(axis=1)
+        risky[start:stop] = (counts[:, RISKY_PATTERNS] > risky_limit).any(axis=1)
+
+    return entropy, max_bucket, risky
+
+
+def load_feedback_matrix(words, cache_dir=CACHE_DIR):
+    """
+    Feedback matrix for words, memory-mapped from the on-disk cache.
+    The cache file is written atomically so concurrent runs never see
+    a partial matrix. cache_dir=None keeps the matrix in memory only.
+    """
+    if cache_dir is None:
+        return compute_feedback_matrix(words)
+
+    path = os.path.join(cache_dir, f"feedback_{word_list_hash(words)}.npy")
+    if os.path.exists(path):
+        matrix = np.load(path, mmap_mode="r")
+        if matrix.shape == (len(words), len(words)):
+            return matrix
+
+    matrix = compute_feedback_matrix(words)
+    try:
+        with atomic_write(path) as f:
+            np.save(f, matrix)
+    except OSError:
+        # read-only checkout: keep the in-memory matrix
+        return matrix
+    return np.load(path, mmap_mode="r")
+
+
+# ------------------------------------------------------------
+# Lazy feedback rows for large word lists
+# ------------------------------------------------------------
+
+class FeedbackRows:
+    """
+    Stands in for the feedback matrix where N x N bytes would be too
+    much: rows are computed when first indexed, every missing row of a
+    request in one vectorized block, and kept in an LRU of rows holding
+    at most max_bytes. With a spill_path, evicted rows go to a
+    memory-mapped scratch file there and are read back instead of
+    recomputed.
+
+    Supports the indexing the solver does on the matrix: matrix[g],
+    matrix[g, cols], matrix[guesses] and matrix[guesses, cols]. The
+    last computes only the cols of rows it does not have, and keeps
+    none of them: a partial row is no use to the next request.
+    """
+
+    def __init__(self, words, max_bytes=ROW_CACHE_BYTES, spill_path=None):
+        self.letters = encode_words(words)
+        n = len(self.letters)
+        self.shape = (n, n)
+        self.dtype = np.dtype(np.uint8)
+        self.max_bytes = max_bytes
+        self.spill_path = spill_path
+
+        self._rows = OrderedDict()
+        self.nbytes = 0
+        self._spill = None
+        self._spilled = np.zeros(n, dtype=bool)
+        self.hits = 0
+        self.misses = 0
+        self.computed = 0
+        self.spill_reads = 0
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        cols = None
+        if type(key) is tuple:
+            key, cols = key
+        if isinstance(key, (int, np.integer)):
+            row = self.row(int(key))
+            return row if cols is None else row[cols]
+        if cols is None:
+            return self.rows(key)
+        return self.block(key, cols)
+
+    def row(self, g):
+        row = self._rows.get(g)
+        if row is None:
+            return self._fetch([g])[g]
+        # the solver's hot path: one cached row
+        self._rows.move_to_end(g)
+        self.hits += 1
+        return row
+
+    def rows(self, guesses):
+        guesses = self._positions(guesses)
+        found = self._fetch(np.unique(guesses).tolist())
+        out = np.empty((len(guesses), self.shape[1]), dtype=np.uint8)
+        for i, g in enumerate(guesses.tolist()):
+            out[i] = found[g]
+        return out
+
+    def block(self, guesses, cols):
+        """rows of guesses at cols, computing only cols of uncached rows"""
+        guesses = self._positions(guesses)
+        cols = np.asarray(cols)
+        if cols.dtype == bool:
+            cols = np.flatnonzero(cols)
+        out = np.empty((len(guesses), len(cols)), dtype=np.uint8)
+        missing = []
+        for i, g in enumerate(guesses.tolist()):
+            row = self._rows.get(g)
+            if row is not None:
+                self._rows.move_to_end(g)
+                self.hits += 1
+                out[i] = row[cols]
+            elif self._spilled[g]:
+                self.spill_reads += 1
+                out[i] = self._spill[g][cols]
+            else:
+                missing.append(i)
+
+        if missing:
+            self.misses += len(missing)
+            out[missing] = compute_rows(self.letters[guesses[missing]], self.letters[cols])
+        return out
+
+    def copy_to(self, out):
+        """Write every row into out, an (N, N) uint8 array."""
+        # straight through: caching a whole-list pass would only evict
+        compute_rows(self.letters, self.letters, out)
+
+    def _positions(self, guesses):
+        if isinstance(guesses, slice):
+            return np.arange(self.shape[0])[guesses]
+        return np.asarray(guesses, dtype=np.intp)
+
+    def _fetch(self, guesses):
+        """{g: row} for guesses, computing the missing rows in one block"""
+        found = {}
+        missing = []
+        for g in guesses:
+            row = self._rows.get(g)
+            if row is not None:
+                self._rows.move_to_end(g)
+                self.hits += 1
+                found[g] = row
+            elif self._spilled[g]:
+                self.spill_reads += 1
+                found[g] = self._store(g, np.array(self._spill[g]))
+            else:
+                missing.append(g)
+
+        if missing:
+            self.misses += len(missing)
+            self.computed += len(missing)
+            codes = compute_rows(self.letters[missing], self.letters)
+            for g, row in zip(missing, codes):
+                # a copy, so evicting the row frees it
+                found[g] = self._store(g, row.copy())
+        return found
+
+    def _store(self, g, row):
+        row.flags.writeable = False
+        self._rows[g] = row
+        self.nbytes += row.nbytes
+        # rows of the current request stay usable through `found`
+        while self.nbytes > self.max_bytes and len(self._rows) > 1:
+            old, evicted = self._rows.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            if self.spill_path is not None and not self._spilled[old]:
+                self._spill_row(old, evicted)
+        return row
+
+    def _spill_row(self, g, row):
+        if self._spill is None:
+            directory = os.path.dirname(self.spill_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._spill = np.memmap(self.spill_path, dtype=np.uint8, mode="w+", shape=self.shape)
+        self._spill[g] = row
+        self._spilled[g] = True
+
+    def info(self):
+        return {
+            "rows": len(self._rows),
+            "bytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "computed": self.computed,
+            "spilled": int(self._spilled.sum()),
+            "spill_reads": self.spill_reads,
+        }
+
+
+def compute_rows(guess_letters, target_letters, out=None):
+    """feedback_codes in BLOCK_ROWS blocks, bounding the temporaries"""
+    if out is None:
+        out = np.empty((len(guess_letters), len(target_letters)), dtype=np.uint8)
+    for start in range(0, len(guess_letters), BLOCK_ROWS):
+        stop = start + BLOCK_ROWS
+        out[start:stop] = feedback_codes(guess_letters[start:stop], target_letters)
+    return out
+
+
+# ------------------------------------------------------------
+# Word index: word <-> row/column of the matrix
+# ------------------------------------------------------------
+
+class WordIndex:
+    def __init__(self, words, cache_dir=CACHE_DIR):
+        check_word_count(words)
+        self.words = tuple(words)
+        self.position = {w: i for i, w in enumerate(self.words)}
+        self.list_hash = word_list_hash(self.words)
+        self.cache_dir = cache_dir
+        self._matrix = None
+        self._rows = {}
+        self._constraints = None
+        # entropy order of the whole list, when an index cache has it
+        self.ranking = None
+
+    def __len__(self):
+        return len(self.words)
+
+    @property
+    def matrix(self):
+        if self._matrix is None:
+            if len(self.words) >= LAZY_MIN_WORDS:
+                self._matrix = FeedbackRows(self.words)
+            else:
+                # plain ndarray view: indexing a memmap subclass is slower
+                self._matrix = np.asarray(load_feedback_matrix(self.words, self.cache_dir))
+        return self._matrix
+
+    def use_lazy_rows(self, max_bytes=ROW_CACHE_BYTES, spill_path=None):
+        """Compute rows on demand from now on, whatever the list size."""
+        self._matrix = FeedbackRows(self.words, max_bytes, spill_path)
+        self._rows.clear()
+        return self._matrix
+
+    @property
+    def constraints(self):
+        """Letter/position index for replaying histories (constraint_index.py)"""
+        if self._constraints is None:
+            from constraint_index import ConstraintIndex
+            self._constraints = ConstraintIndex.for_words(self.words)
+        return self._constraints
+
+    def row(self, guess):
+        """Feedback row of guess as bytes: row[i] is a plain int code."""
+        r = self._rows.get(guess)
+        if r is None:
+            r = self._keep(guess, self.matrix[guess].tobytes())
+        return r
+
+    def rows(self, guesses):
+        """row() of each of guesses; lazy rows missing are computed together"""
+        matrix = self.matrix
+        if isinstance(matrix, FeedbackRows):
+            missing = [g for g in guesses if g not in self._rows]
+            if len(missing) > 1:
+                fetched = dict(zip(missing, matrix.rows(missing)))
+                return [
+                    self._rows.get(g) or self._keep(g, fetched[g].tobytes())
+                    for g in guesses
+                ]
+        return [self.row(g) for g in guesses]
+
+    def _keep(self, guess, r):
+        matrix = self.matrix
+        if isinstance(matrix, FeedbackRows) and len(self._rows) * len(r) >= matrix.max_bytes:
+            # lazy rows: these copies get a budget of their own
+            self._rows.clear()
+        self._rows[guess] = r
+        return r
+
+    # ------------------------------------------------------------
+    # Sharing the matrix between processes
+    # ------------------------------------------------------------
+
+    def share(self):
+        """
+        Copy the matrix into a new shared memory block. The caller owns
+        the block: close() and unlink() it once workers are done. Lazy
+        rows are all computed for it: workers get the whole matrix.
+        """
+        from multiprocessing import shared_memory
+
+        matrix = self.matrix
+        n = len(self.words)
+        shm = shared_memory.SharedMemory(create=True, size=max(n * n, 1))
+        out = np.ndarray((n, n), dtype=np.uint8, buffer=shm.buf)
+        if isinstance(matrix, FeedbackRows):
+            matrix.copy_to(out)
+        else:
+            out[:] = matrix
+        return shm
+
+    @classmethod
+    def from_parts(cls, words, matrix, constraints=None, ranking=None):
+        """Index whose matrix (and letter masks, ranking) are already built."""
+        index = cls(words, cache_dir=None)
+        # no matrix: a list too long to store one gets lazy rows
+        index._matrix = None if matrix is None else np.asarray(matrix)
+        index._constraints = constraints
+        index.ranking = ranking
+        return index
+
+    @classmethod
+    def attach(cls, words, shm_name):
+        """Index over words whose matrix lives in a block from share()."""
+        from multiprocessing import shared_memory
+
+        index = cls(words, cache_dir=None)
+        shm = shared_memory.SharedMemory(name=shm_name)
+        index._shm = shm
+        index._matrix = np.ndarray((len(words), len(words)), dtype=np.uint8, buffer=shm.buf)
+        index._matrix.flags.writeable = False
+        return index
+
+    def covers(self, words):
+        position = self.position
+        return all(w in position for w in words)
+
+    def indices(self, words):
+        """Positions of words in the index, or None if any is missing."""
+        position = self.position
+        try:
+            return [position[w] for w in words]
+        except KeyError:
+            return None
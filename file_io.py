@@ -0,0 +1,55 @@
+# ============================================================
+# Shared file writing helpers
+# ============================================================
+#
+# atomic_write: a file is replaced whole or not at all. It is written
+# under a temporary name beside the target (unique per process) and
+# renamed into place, so concurrent runs never read a partial file.
+#
+# Binary files with a JSON header (index_cache.py, strategy_tree.py)
+# start with:
+#
+#   8 bytes   magic
+#   4 bytes   uint32 length of the JSON header (little endian)
+#   n bytes   JSON header, padded with spaces to a multiple of 8
+
+import json
+import os
+import struct
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_write(path, mode="wb"):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, mode) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def pack_header(magic, header):
+    """magic, length and padded JSON header, as bytes"""
+    data = json.dumps(header).encode()
+    data += b" " * (-(len(magic) + 4 + len(data)) % 8)
+    return magic + struct.pack("<I", len(data)) + data
+
+
+def read_header(f, magic):
+    """
+    returns: (header, offset of the data after it) from a binary file
+    opened at its start, or None if it does not start with magic
+    """
+    if f.read(len(magic)) != magic:
+        return None
+    (size,) = struct.unpack("<I", f.read(4))
+    return json.loads(f.read(size)), len(magic) + 4 + size
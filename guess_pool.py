@@ -0,0 +1,94 @@
+# ============================================================
+# Parallel candidate-guess evaluation for optimal_word
+# ============================================================
+#
+# Workers score candidate guesses (worst_case_depth) in entropy order
+# and share the best score found so far, so every worker prunes against
+# the incumbent, not just its own guesses. The feedback matrix is put
+# in shared memory once; each worker keeps its own min_depth cache for
+# the lifetime of the pool, a share of MIN_DEPTH_CACHE_BYTES.
+#
+# The incumbent is stored as score * ORDER_SPAN + order, so one integer
+# min gives the best score and, among equal scores, the earliest guess.
+# A guess is only pruned against a later guess's score plus one: ties
+# must stay exact so the caller can break them the way the serial loop
+# does, and the result is the same word whatever the timing.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Value
+
+
+ORDER_SPAN = 1 << 20
+NO_INCUMBENT = 1 << 62
+
+_incumbent = None
+
+def _init_worker(words, shm_name, incumbent, cache_bytes):
+    import wordle_solver as ws
+
+    global _incumbent
+    _incumbent = incumbent
+    ws.attach_worker(words, shm_name, cache_bytes)
+
+
+def _score(args):
+    import wordle_solver as ws
+
+    state, guess, order, depth_left, exact_below = args
+    best = _incumbent.value
+    bound = float("inf")
+    if best < NO_INCUMBENT:
+        score, at = divmod(best, ORDER_SPAN)
+        bound = score if at < order else max(score + 1, exact_below)
+
+    worst = ws.worst_case_depth(state, guess, depth_left, bound)
+    if worst != float("inf"):
+        encoded = worst * ORDER_SPAN + order
+        with _incumbent.get_lock():
+            if encoded < _incumbent.value:
+                _incumbent.value = encoded
+    return worst
+
+
+class GuessPool:
+    def __init__(self, index, workers=None):
+        import wordle_solver as ws
+
+        self.list_hash = index.list_hash
+        self.workers = workers or os.cpu_count()
+        self._shm = index.share()
+        self._incumbent = Value("q", NO_INCUMBENT)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(
+                index.words, self._shm.name, self._incumbent,
+                ws.worker_cache_bytes(self.workers),
+            ),
+        )
+
+    def worst_case_depths(self, state, guesses, depth_left, exact_below=0):
+        """
+        state       : positions of the remaining candidates
+        guesses     : positions of the guesses to score, in priority order
+        exact_below : scores under this are always exact, so the caller
+                      can apply an early stop at a fixed score
+
+        returns: one worst_case_depth per guess; a score is exact when it
+        can change the serial loop's answer and inf otherwise
+        """
+        self._incumbent.value = NO_INCUMBENT
+        tasks = [
+            (state, guess, order, depth_left, exact_below)
+            for order, guess in enumerate(guesses)
+        ]
+        return list(self._executor.map(_score, tasks))
+
+    def close(self):
+        if self._executor is None:
+            return
+        self._executor.shutdown()
+        self._executor = None
+        self._shm.close()
+        self._shm.unlink()
@@ -0,0 +1,181 @@
+# ============================================================
+# Binary index cache for word list files
+# ============================================================
+#
+# Everything derived from a word list file, in one memory-mapped file
+# kept beside it (.wordle_cache/index_<file name>.bin): the words, the
+# feedback matrix, the letter masks of constraint_index.py and the
+# entropy ranking of the whole list. The header records a hash of the
+# word file's bytes, so an edited word list is noticed and the cache
+# rebuilt.
+#
+# File layout (little endian):
+#
+#   8 bytes   magic b"WWINDEX\0"
+#   4 bytes   uint32 length of the JSON header
+#   n bytes   JSON header (version, content_hash, list_hash, size and
+#             the section table {name: [offset, dtype, shape]}),
+#             padded with spaces to a multiple of 8
+#   sections  letters (size, 5) u1, matrix (size, size) u1,
+#             at_bits (5, 26, m) u1, at_least_bits (26, 5, m) u1,
+#             ranking (size,) <i4; each starts on a SECTION_ALIGN
+#             boundary. Lists of LAZY_MIN_WORDS or more have no matrix
+#             section: their rows are computed as they are used.
+
+import hashlib
+import os
+import struct
+
+from file_io import atomic_write, pack_header, read_header
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+
+INDEX_VERSION = 1
+MAGIC = b"WWINDEX\0"
+SECTION_ALIGN = 64
+
+
+def index_path(words_path):
+    directory = os.path.dirname(os.path.abspath(words_path))
+    name = os.path.basename(words_path)
+    return os.path.join(directory, ".wordle_cache", f"index_{name}.bin")
+
+
+def content_hash(data):
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+def parse_words(data):
+    return tuple(
+        w.strip() for w in data.decode().splitlines() if len(w.strip()) == 5
+    )
+
+
+# ------------------------------------------------------------
+# Build and serialization
+# ------------------------------------------------------------
+
+def build_sections(words):
+    from constraint_index import ConstraintIndex
+    from feedback_matrix import (
+        LAZY_MIN_WORDS,
+        FeedbackRows,
+        compute_feedback_matrix,
+        encode_words,
+        guess_stats,
+    )
+
+    lazy = len(words) >= LAZY_MIN_WORDS
+    # the ranking still sees every row, but a lazy list never holds
+    # more than the row cache's budget of them
+    matrix = FeedbackRows(words) if lazy else compute_feedback_matrix(words)
+    constraints = ConstraintIndex.for_words(words)
+    state = np.arange(len(words))
+    entropy, _, _ = guess_stats(matrix, state, state)
+    sections = {
+        "letters": encode_words(words),
+        "matrix": matrix,
+        "at_bits": constraints.at_bits,
+        "at_least_bits": constraints.at_least_bits,
+        # same order as sort_words_by_entropy on the whole list
+        "ranking": np.argsort(-entropy, kind="stable").astype("<i4"),
+    }
+    if lazy:
+        del sections["matrix"]
+    return sections
+
+
+def write_index(path, digest, words, sections):
+    from feedback_matrix import word_list_hash
+
+    table = {}
+    offset = 0
+    for name, array in sections.items():
+        offset += -offset % SECTION_ALIGN
+        table[name] = [offset, array.dtype.str, list(array.shape)]
+        offset += array.nbytes
+
+    header = pack_header(MAGIC, {
+        "version": INDEX_VERSION,
+        "content_hash": digest,
+        "list_hash": word_list_hash(words),
+        "size": len(words),
+        "sections": table,
+    })
+    start = len(header)
+    start += -start % SECTION_ALIGN
+
+    with atomic_write(path) as f:
+        f.write(header)
+        for name, array in sections.items():
+            f.seek(start + table[name][0])
+            f.write(np.ascontiguousarray(array).tobytes())
+
+
+def read_index(path, digest):
+    """(header, sections) memory-mapped from path, or None if missing or stale"""
+    try:
+        with open(path, "rb") as f:
+            found = read_header(f, MAGIC)
+    except (OSError, ValueError, struct.error):
+        return None
+    if found is None:
+        return None
+    header, start = found
+    if header.get("version") != INDEX_VERSION or header.get("content_hash") != digest:
+        return None
+
+    start += -start % SECTION_ALIGN
+    raw = np.memmap(path, dtype=np.uint8, mode="r")
+    sections = {}
+    for name, (offset, dtype, shape) in header["sections"].items():
+        dtype = np.dtype(dtype)
+        nbytes = dtype.itemsize * int(np.prod(shape))
+        chunk = raw[start + offset:start + offset + nbytes]
+        sections[name] = np.asarray(chunk).view(dtype).reshape(shape)
+    return header, sections
+
+
+# ------------------------------------------------------------
+# Loading a word list file
+# ------------------------------------------------------------
+
+def index_from_sections(words, sections):
+    from constraint_index import ConstraintIndex
+    from feedback_matrix import WordIndex
+
+    constraints = ConstraintIndex(len(words), sections["at_bits"], sections["at_least_bits"])
+    return WordIndex.from_parts(words, sections.get("matrix"), constraints, sections["ranking"])
+
+
+def load_word_file(words_path):
+    """
+    returns: (words, WordIndex) for a word list file, from its index
+    cache when that matches the file, else built and cached
+    """
+    with open(words_path, "rb") as f:
+        data = f.read()
+    digest = content_hash(data)
+    path = index_path(words_path)
+
+    cached = read_index(path, digest)
+    if cached is None:
+        from feedback_matrix import check_word_count
+
+        words = parse_words(data)
+        # before the N x N work of building the sections
+        check_word_count(words)
+        sections = build_sections(words)
+        try:
+            write_index(path, digest, words, sections)
+        except OSError:
+            # read-only checkout: keep what was just built
+            return words, index_from_sections(words, sections)
+        cached = read_index(path, digest)
+
+    header, sections = cached
+    text = sections["letters"].tobytes().decode("ascii")
+    words = tuple(text[i:i + 5] for i in range(0, len(text), 5))
+    return words, index_from_sections(words, sections)
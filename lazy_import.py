@@ -0,0 +1,23 @@
+# ============================================================
+# Deferred module imports
+# ============================================================
+#
+# numpy alone is most of a CLI's start-up time. A module imported
+# through lazy_import is only executed on first attribute access, so
+# paths that never compute anything (--help, argument errors) skip it.
+
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
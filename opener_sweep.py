@@ -0,0 +1,253 @@
+# ============================================================
+# Exhaustive opener sweep
+# ============================================================
+#
+# Ranks openers by playing every target from each one with
+# simulate_prefix_shared, across a process pool: by the most guesses
+# the solver's strategy needs for any target (7 for a target it fails),
+# then by the number of failed targets, then by the average number of
+# guesses.
+#
+# Every finished opener is appended to a JSON lines checkpoint, the
+# first line recording the word list, solver and solver version.
+# Running again with the same checkpoint skips the openers already in
+# it, so a killed sweep resumes where it stopped. The ranking so far is rewritten every few
+# openers while the sweep runs.
+#
+#     python opener_sweep.py --workers 16
+#     python opener_sweep.py --openers abode,scrap,crane --top 3
+
+import json
+import os
+import signal
+import sys
+import time
+from multiprocessing import Pool
+
+from file_io import atomic_write
+
+
+DEFAULT_CHECKPOINT = "opener_sweep.jsonl"
+DEFAULT_RANKING = "opener_ranking.txt"
+
+
+_words = None
+_solver = None
+
+def _init_worker(words, shm_name, solver, cache_bytes):
+    import wordle_solver as ws
+
+    global _words, _solver
+    _words = words
+    _solver = solver
+    ws.attach_worker(words, shm_name, cache_bytes)
+    # Ctrl-C and kills are the parent's to handle: it terminates the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+def _sweep_opener(opener):
+    from simulation import simulate_prefix_shared
+
+    start = time.perf_counter()
+    results, calls = simulate_prefix_shared(opener, _words, _words, _solver)
+    return opener_record(opener, results, calls, time.perf_counter() - start)
+
+
+def opener_record(opener, results, calls, seconds):
+    attempts = list(results.values())
+    return {
+        "opener": opener,
+        "worst": max(attempts),
+        "average": sum(attempts) / len(attempts),
+        "failures": sum(1 for a in attempts if a > 6),
+        "solver_calls": calls,
+        "seconds": round(seconds, 3),
+    }
+
+
+def rank_key(record):
+    return record["worst"], record["failures"], record["average"], record["opener"]
+
+
+# ------------------------------------------------------------
+# Checkpoint
+# ------------------------------------------------------------
+
+def read_checkpoint(path, list_hash, solver, solver_version):
+    """{opener: record} already swept, or {} for a new checkpoint"""
+    try:
+        with open(path) as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return {}
+    if not lines:
+        return {}
+
+    header = json.loads(lines[0])
+    if (
+        header.get("list_hash") != list_hash
+        or header.get("solver") != solver
+        or header.get("solver_version") != solver_version
+    ):
+        # rankings from two versions of a solver do not mix
+        raise ValueError(
+            f"{path} was written for another word list, solver or solver version;"
+            " pass a different --checkpoint"
+        )
+    done = {}
+    for line in lines[1:]:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            # the last line of a killed run may be cut short
+            continue
+        done[record["opener"]] = record
+    return done
+
+
+def open_checkpoint(path, list_hash, solver, solver_version):
+    """checkpoint opened for appending, with its header written if new"""
+    new = not os.path.exists(path) or os.path.getsize(path) == 0
+    f = open(path, "a")
+    if new:
+        header = {"list_hash": list_hash, "solver": solver, "solver_version": solver_version}
+        f.write(json.dumps(header) + "\n")
+        f.flush()
+    elif not _ends_with_newline(path):
+        # finish a line cut short so the next record starts cleanly
+        f.write("\n")
+    return f
+
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def write_ranking(path, records, total):
+    ranked = sorted(records, key=rank_key)
+    with atomic_write(path, "w") as f:
+        f.write(f"# {len(ranked)}/{total} openers: rank opener worst average failures\n")
+        for rank, r in enumerate(ranked, 1):
+            f.write(f"{rank} {r['opener']} {r['worst']} {r['average']:.4f} {r['failures']}\n")
+    return ranked
+
+
+# ------------------------------------------------------------
+# Sweep
+# ------------------------------------------------------------
+
+def sweep(
+    openers=None,
+    words_file="words.txt",
+    solver="wordle_solver_new",
+    workers=None,
+    checkpoint=DEFAULT_CHECKPOINT,
+    ranking=DEFAULT_RANKING,
+    report_every=10,
+    top=10,
+):
+    """
+    returns: records of every opener swept (including earlier runs'),
+    best first
+    """
+    import wordle_solver as ws
+
+    words = ws.load_words(words_file)
+    index = ws.word_index_for(words)
+    if openers is None:
+        # likely good openers first, so early rankings mean something
+        openers = ws.sort_words_by_entropy(words)
+    unknown = [o for o in openers if o not in index.position]
+    if unknown:
+        raise ValueError(f"not in {words_file}: {' '.join(unknown[:10])}")
+
+    version = ws.solver_version(solver)
+    done = read_checkpoint(checkpoint, index.list_hash, solver, version)
+    records = [done[o] for o in openers if o in done]
+    todo = [o for o in openers if o not in done]
+    print(f"{len(records)} of {len(openers)} openers already in {checkpoint}", flush=True)
+    if not todo:
+        return write_ranking(ranking, records, len(openers))
+
+    shm = index.share()
+    pool = Pool(
+        workers,
+        initializer=_init_worker,
+        initargs=(index.words, shm.name, solver, ws.worker_cache_bytes(workers)),
+    )
+    start = time.perf_counter()
+    try:
+        with open_checkpoint(checkpoint, index.list_hash, solver, version) as out:
+            for n, record in enumerate(pool.imap_unordered(_sweep_opener, todo), 1):
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                records.append(record)
+
+                if n % report_every == 0 or n == len(todo):
+                    ranked = write_ranking(ranking, records, len(openers))
+                    elapsed = time.perf_counter() - start
+                    eta = (len(todo) - n) * elapsed / n
+                    best = ", ".join(
+                        f"{r['opener']} {r['worst']}/{r['average']:.3f}" for r in ranked[:top]
+                    )
+                    print(
+                        f"[{len(records)}/{len(openers)}] eta {eta:.0f}s, best: {best}",
+                        flush=True,
+                    )
+    finally:
+        # on Ctrl-C too: openers in flight are lost, the checkpoint is not
+        pool.terminate()
+        pool.join()
+        shm.close()
+        shm.unlink()
+
+    return write_ranking(ranking, records, len(openers))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Rank openers by worst-case and average guesses over every target."
+    )
+    parser.add_argument("--openers", help="comma-separated openers (default: every word)")
+    parser.add_argument("--words-file", default="words.txt")
+    parser.add_argument("--solver", default="wordle_solver_new",
+                        help="module whose optimal_word plays the games")
+    parser.add_argument("--workers", type=int, default=None, help="default: one per CPU")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT,
+                        help="finished openers, read to resume and appended to"
+                        f" (default: {DEFAULT_CHECKPOINT})")
+    parser.add_argument("--ranking", default=DEFAULT_RANKING,
+                        help=f"ranking so far, rewritten as the sweep runs (default: {DEFAULT_RANKING})")
+    parser.add_argument("--report-every", type=int, default=10, metavar="N",
+                        help="update the ranking every N openers")
+    parser.add_argument("--top", type=int, default=10, help="openers shown in progress lines")
+    args = parser.parse_args()
+
+    # a kill stops the sweep like Ctrl-C: workers are stopped, the
+    # shared matrix is released and the checkpoint keeps every finished
+    # opener
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    openers = None
+    if args.openers:
+        openers = [o.strip() for o in args.openers.split(",") if o.strip()]
+    try:
+        ranked = sweep(
+            openers, args.words_file, args.solver, args.workers,
+            args.checkpoint, args.ranking, args.report_every, args.top,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    except KeyboardInterrupt:
+        print(f"\ninterrupted; run again with --checkpoint {args.checkpoint} to resume")
+        sys.exit(130)
+
+    for rank, r in enumerate(ranked[:args.top], 1):
+        print(f"{rank:3d}. {r['opener']}  worst {r['worst']}  average {r['average']:.4f}"
+              f"  failures {r['failures']}")
+    print("ranking written to", args.ranking)
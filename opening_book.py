@@ -0,0 +1,146 @@
+# ============================================================
+# Precomputed opening book
+# ============================================================
+#
+# Every game that starts with the same opener lands in one of at most
+# 243 feedback buckets, so the answer for turn 2 (and optionally turn 3)
+# can be solved ahead of time. The book maps a candidate state, by a
+# digest of its state key, plus depth_left to the solver's guess.
+#
+# Build a book for the recommended opener:
+#     python opening_book.py --opener abode --second-move
+#
+# The CLIs load every book built into .wordle_cache/ and fall back to
+# live search for any state not in them. A book only answers for the
+# solver and SOLVER_VERSION it was built with: rebuild it after a
+# version bump.
+
+import glob
+import hashlib
+import json
+import os
+
+from feedback_matrix import ALL_GREEN, CACHE_DIR
+from file_io import atomic_write
+
+
+BOOK_VERSION = 1
+
+
+def book_path(opener, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"opening_book_{opener}.json")
+
+
+def built_book_paths(cache_dir=CACHE_DIR):
+    return sorted(glob.glob(book_path("*", cache_dir)))
+
+
+def entry_key(state, depth_left):
+    digest = hashlib.blake2b(state, digest_size=8).hexdigest()
+    return f"{depth_left}:{digest}"
+
+
+class OpeningBook:
+    def __init__(self, opener, solver, list_hash, entries=None, solver_version=None):
+        self.opener = opener
+        self.solver = solver
+        # the solver module's SOLVER_VERSION when the book was built
+        self.solver_version = solver_version
+        self.list_hash = list_hash
+        self.entries = {} if entries is None else entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, solver, solver_version, list_hash, state, depth_left):
+        if (solver, solver_version, list_hash) != (self.solver, self.solver_version, self.list_hash):
+            return None
+        return self.entries.get(entry_key(state, depth_left))
+
+    def save(self, path):
+        data = {
+            "version": BOOK_VERSION,
+            "opener": self.opener,
+            "solver": self.solver,
+            "solver_version": self.solver_version,
+            "list_hash": self.list_hash,
+            "entries": self.entries,
+        }
+        with atomic_write(path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+
+def load_book(path):
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("version") != BOOK_VERSION:
+        raise ValueError(f"unsupported opening book version in {path}")
+    # books from before solver versions have none and never match
+    return OpeningBook(
+        data["opener"], data["solver"], data["list_hash"], data["entries"],
+        data.get("solver_version"),
+    )
+
+
+# ------------------------------------------------------------
+# Build step
+# ------------------------------------------------------------
+
+def build_book(words, opener, solver="wordle_solver", second_move=False, verbose=False):
+    """
+    Solve every bucket of opener over words with the solver module's
+    optimal_word (depth_left=5), and with second_move every bucket of
+    that answer as well (depth_left=4).
+    """
+    import importlib
+
+    import wordle_solver as ws
+
+    module = importlib.import_module(solver)
+    index = ws.word_index_for(words)
+    position = index.position
+    book = OpeningBook(opener, solver, index.list_hash, solver_version=module.SOLVER_VERSION)
+
+    buckets = ws.partition_codes(ws.state_of(words), position[opener])
+    for n, (code, bucket) in enumerate(buckets, 1):
+        if code == ALL_GREEN:
+            continue
+        guess = module.optimal_word(ws.words_of(bucket), 5)
+        book.entries[entry_key(ws.state_key(bucket), 5)] = guess
+        if verbose:
+            print(f"[{n}/{len(buckets)}] {len(bucket)} words -> {guess}", flush=True)
+
+        if not second_move or len(bucket) <= 2:
+            continue
+        for code2, bucket2 in ws.partition_codes(bucket, position[guess]):
+            if code2 == ALL_GREEN:
+                continue
+            guess2 = module.optimal_word(ws.words_of(bucket2), 4)
+            book.entries[entry_key(ws.state_key(bucket2), 4)] = guess2
+
+    return book
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build an opening book for one opener.")
+    parser.add_argument("--opener", default="abode")
+    parser.add_argument("--words-file", default="words.txt")
+    parser.add_argument("--solver", default="wordle_solver",
+                        choices=["wordle_solver", "wordle_solver_new"])
+    parser.add_argument("--second-move", action="store_true",
+                        help="also solve every bucket of the second guess")
+    parser.add_argument("--output", help="default: .wordle_cache/opening_book_<opener>.json")
+    args = parser.parse_args()
+
+    import wordle_solver as ws
+
+    words = ws.load_words(args.words_file)
+    if args.opener not in ws.word_index_for(words).position:
+        parser.error(f"opener {args.opener!r} is not in {args.words_file}")
+
+    book = build_book(words, args.opener, args.solver, args.second_move, verbose=True)
+    output = args.output or book_path(args.opener)
+    book.save(output)
+    print(f"wrote {len(book)} entries to {output}")
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Benchmark the Python solver's kernels and end-to-end turns.
+
+Cases:
+  feedback                       10k (guess, target) string feedbacks
+  partition/<n>                  partition of the first n words
+  sort_words_by_entropy/<n>      entropy ranking of the first n words
+  select_guess_words/<n>         guess filter on the ranked first n words
+  min_depth/abode-<fb>           min_depth of a post-'abode' bucket
+  optimal_guess_from_feedback/abode-<fb>
+  optimal_word/<n>               depth 6 on the first n words, the
+                                 sizes scripts/profile_solver.js uses
+  simulate_single_game/sample    a fixed sample of full games
+
+Searches start from a cold min_depth cache on every run, with no
+opening book or store. Each case reports the median and min of its runs.
+
+Usage (from the repo root):
+    python3 scripts/bench_solver.py run --output bench_before.json
+    python3 scripts/bench_solver.py run --output bench_after.json
+    python3 scripts/bench_solver.py compare bench_before.json bench_after.json
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+SIZES = [10, 50, 100, 200, 400, 600, 800, 1000]
+OPENER = "abode"
+# post-opener buckets at these size quantiles (1.0 = largest); proving
+# min_depth of the largest ones takes tens of seconds, so it skips them
+TURN_QUANTILES = [1.0, 0.9, 0.75, 0.5]
+MIN_DEPTH_QUANTILES = [0.9, 0.75, 0.5, 0.25]
+SIMULATION_SAMPLE = 20
+SEED = 0
+
+
+def measure(fn, setup=None, repeats=5, min_time=0.2, max_repeats=50):
+    """Seconds per run: at least repeats runs, more while under min_time."""
+    times = []
+    while len(times) < repeats or (sum(times) < min_time and len(times) < max_repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        "median_s": statistics.median(times),
+        "min_s": min(times),
+        "runs": len(times),
+    }
+
+
+def cases(words):
+    import wordle_solver as ws
+    import wordle_solver_new as wn
+
+    rng = random.Random(SEED)
+    cold = ws.min_depth_cache_clear
+
+    pairs = [(rng.choice(words), rng.choice(words)) for _ in range(10000)]
+    yield "feedback", lambda: [ws.feedback(g, t) for g, t in pairs], None
+
+    for n in SIZES:
+        sample = words[:n]
+        ranked = ws.sort_words_by_entropy(sample)
+        yield f"partition/{n}", lambda s=sample: ws.partition(s, s[0]), None
+        yield f"sort_words_by_entropy/{n}", lambda s=sample: ws.sort_words_by_entropy(s), None
+        yield f"select_guess_words/{n}", lambda r=ranked: ws.select_guess_words(r, 5), None
+
+    index = ws.word_index_for(words)
+    buckets = sorted(
+        (b for code, b in ws.partition_codes(ws.state_of(words), index.position[OPENER])
+         if len(b) > 2),
+        key=len,
+    )
+
+    def bucket_at(q):
+        bucket = buckets[round(q * (len(buckets) - 1))]
+        return bucket, ws.feedback(OPENER, ws.words_of(bucket)[0])
+
+    for q in MIN_DEPTH_QUANTILES:
+        bucket, fb = bucket_at(q)
+        key = ws.state_key(bucket)
+        yield f"min_depth/{OPENER}-{fb}", lambda k=key: ws.min_depth(k, 4), cold
+    for q in TURN_QUANTILES:
+        _, fb = bucket_at(q)
+        yield (
+            f"optimal_guess_from_feedback/{OPENER}-{fb}",
+            lambda fb=fb: ws.optimal_guess_from_feedback(words, OPENER, fb, 5),
+            cold,
+        )
+
+    for n in SIZES:
+        yield f"optimal_word/{n}", lambda s=words[:n]: ws.optimal_word(s, 6), cold
+
+    targets = rng.sample(words, SIMULATION_SAMPLE)
+
+    def simulate():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for t in targets:
+                wn.simulate_single_game(t, OPENER, words)
+
+    yield "simulate_single_game/sample", simulate, cold
+
+
+def git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    import numpy as np
+
+    import wordle_solver as ws
+
+    words = ws.load_words(args.words_file)
+    results = {}
+    for name, fn, setup in cases(words):
+        if args.only and not fnmatch.fnmatchcase(name, args.only):
+            continue
+        results[name] = measure(fn, setup, repeats=args.repeats)
+        r = results[name]
+        print(f"{name:50s} median {r['median_s'] * 1000:10.3f} ms"
+              f"  min {r['min_s'] * 1000:10.3f} ms  ({r['runs']} runs)", flush=True)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "list_hash": ws.word_index_for(words).list_hash,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {len(results)} results to {args.output}")
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        base = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    if base["meta"].get("list_hash") != current["meta"].get("list_hash"):
+        print("warning: runs used different word lists")
+
+    regressions = 0
+    for name, new in current["results"].items():
+        old = base["results"].get(name)
+        if old is None:
+            print(f"{name:50s} new")
+            continue
+        ratio = new[args.stat] / old[args.stat] if old[args.stat] else float("inf")
+        if ratio > 1 + args.threshold:
+            flag = "REGRESSION"
+            regressions += 1
+        elif ratio < 1 - args.threshold:
+            flag = "faster"
+        else:
+            flag = ""
+        print(f"{name:50s} {old[args.stat] * 1000:10.3f} -> {new[args.stat] * 1000:10.3f} ms"
+              f"  x{ratio:6.2f}  {flag}")
+    for name in sorted(base["results"].keys() - current["results"].keys()):
+        print(f"{name:50s} missing")
+
+    print(f"{regressions} regression(s) over {args.threshold:.0%} ({args.stat})")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("run", help="run the benchmarks and save JSON")
+    p.add_argument("--output", default="bench_results.json")
+    p.add_argument("--words-file", default=str(ROOT / "words.txt"))
+    p.add_argument("--repeats", type=int, default=3, help="minimum runs per case")
+    p.add_argument("--only", metavar="PATTERN",
+                   help="run only the case of this name, or the cases matching a glob,"
+                   " e.g. 'partition/*'")
+
+    p = sub.add_parser("compare", help="flag regressions between two runs")
+    p.add_argument("baseline")
+    p.add_argument("current")
+    p.add_argument("--threshold", type=float, default=0.15,
+                   help="relative slowdown counted as a regression (default: 0.15)")
+    p.add_argument("--stat", choices=["median_s", "min_s"], default="min_s")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+        return 0
+    return compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# ============================================================
+# Opt-in search statistics
+# ============================================================
+#
+# Filled by wordle_solver while an optimal_word(..., stats=...) call
+# runs. The solver only checks whether a collector is active, so with
+# none the search pays one comparison per node.
+#
+#   nodes        _min_depth searches by depth_left
+#   partitions   guesses split into buckets
+#   cache_hits   min_depth answered from cached bounds (memory or store)
+#   store_hits   ... of which were read from the on-disk store
+#   prunes       "bound": admissible bound ended a node's guess loop
+#                "cutoff": a bucket failed, the guess was abandoned
+#                "duplicate": guess repeated an earlier partition
+#                "worst_case": a candidate could not beat the incumbent
+#   early_exits  "all_singletons", "depth5_best4", "book", "store",
+#                "deadline"
+#   phases       seconds in entropy_sort, guess_filter, search, total
+#
+# Searches run by guess_pool.py workers happen in other processes and
+# are not counted.
+
+from collections import Counter, defaultdict
+
+
+class SearchStats:
+    def __init__(self):
+        self.nodes = Counter()
+        self.partitions = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.store_hits = 0
+        self.prunes = Counter()
+        self.early_exits = Counter()
+        self.phases = defaultdict(float)
+        self.guesses_evaluated = 0
+        self.peak_cache_entries = 0
+        self.cache_bytes = 0
+
+    @property
+    def cache_hit_rate(self):
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+
+    def as_dict(self):
+        return {
+            "nodes": dict(sorted(self.nodes.items(), reverse=True)),
+            "partitions": self.partitions,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_rate": self.cache_hit_rate,
+            "store_hits": self.store_hits,
+            "prunes": dict(self.prunes),
+            "early_exits": dict(self.early_exits),
+            "phases": dict(self.phases),
+            "guesses_evaluated": self.guesses_evaluated,
+            "peak_cache_entries": self.peak_cache_entries,
+            "cache_bytes": self.cache_bytes,
+        }
+
+    def report(self):
+        nodes = ", ".join(f"{d}: {n}" for d, n in sorted(self.nodes.items(), reverse=True))
+        phases = ", ".join(f"{k} {v * 1000:.1f}ms" for k, v in self.phases.items())
+        return "\n".join([
+            f"nodes by depth_left: {nodes or '-'} (total {sum(self.nodes.values())})",
+            f"partitions: {self.partitions}, guesses evaluated: {self.guesses_evaluated}",
+            f"min_depth cache: {self.cache_hits} hits, {self.cache_misses} misses"
+            f" ({self.cache_hit_rate:.1%}), {self.store_hits} from the store",
+            f"prunes: {dict(self.prunes) or '-'}",
+            f"early exits: {dict(self.early_exits) or '-'}",
+            f"time: {phases}",
+            f"cache: peak {self.peak_cache_entries} entries, {self.cache_bytes} bytes now",
+        ])
@@ -0,0 +1,89 @@
+# ============================================================
+# Binary game session state
+# ============================================================
+#
+# What one game has learned so far: the guesses and feedback played,
+# and the remaining candidates as a bitmap over the word list. A few
+# hundred bytes, read and written without parsing any text.
+#
+# File layout (little endian):
+#
+#   8 bytes   magic b"WWSESS1\0"
+#   16 bytes  word list hash (ascii hex, see word_list_hash)
+#   4 bytes   uint32 word count
+#   1 byte    uint8 number of turns played
+#   6 bytes   per turn: guess (5 ascii letters), feedback code (uint8)
+#   n bytes   candidate bitmap, bit i set if word i is still possible,
+#             ceil(word count / 8) bytes (numpy.packbits order)
+
+import os
+import struct
+
+from feedback_matrix import CACHE_DIR, pattern_code, pattern_string
+from file_io import atomic_write
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+
+MAGIC = b"WWSESS1\0"
+HEADER = struct.Struct("<8s16sIB")
+TURN = struct.Struct("<5sB")
+
+DEFAULT_SESSION_PATH = os.path.join(CACHE_DIR, "session.bin")
+
+
+class SessionState:
+    def __init__(self, list_hash, size, history=(), state=None):
+        """
+        size   : number of words in the list
+        history: [(guess, feedback_string), ...]
+        state  : positions of the remaining candidates (all if None)
+        """
+        self.list_hash = list_hash
+        self.size = size
+        self.history = list(history)
+        self.state = np.arange(size, dtype=np.intp) if state is None else state
+
+    def played(self, guess, fb, state):
+        """The session after one more turn that left state."""
+        return SessionState(self.list_hash, self.size, self.history + [(guess, fb)], state)
+
+    def to_bytes(self):
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.state] = True
+        turns = b"".join(
+            TURN.pack(guess.encode("ascii"), pattern_code(fb)) for guess, fb in self.history
+        )
+        header = HEADER.pack(MAGIC, self.list_hash.encode("ascii"), self.size, len(self.history))
+        return header + turns + np.packbits(mask).tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, list_hash, size, turns = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a session state file")
+        history = []
+        offset = HEADER.size
+        for _ in range(turns):
+            guess, code = TURN.unpack_from(data, offset)
+            history.append((guess.decode("ascii"), pattern_string(code)))
+            offset += TURN.size
+        bits = np.frombuffer(data, dtype=np.uint8, offset=offset)
+        if len(bits) != (size + 7) // 8:
+            raise ValueError("truncated session state file")
+        state = np.flatnonzero(np.unpackbits(bits, count=size))
+        return cls(list_hash.decode("ascii"), size, history, state)
+
+    def save(self, path=DEFAULT_SESSION_PATH):
+        with atomic_write(path) as f:
+            f.write(self.to_bytes())
+
+
+def load_session(path, index):
+    """Session saved for index's word list (a WordIndex)."""
+    with open(path, "rb") as f:
+        session = SessionState.from_bytes(f.read())
+    if session.list_hash != index.list_hash or session.size != len(index):
+        raise ValueError(f"{path} was saved for a different word list")
+    return session
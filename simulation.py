@@ -0,0 +1,371 @@
+# ============================================================
+# Simulation runners
+# ============================================================
+#
+# simulate_parallel plays wordle_solver_new.simulate_single_game for
+# many targets across a process pool. The parent builds the feedback
+# matrix once and puts it in shared memory; every worker attaches to
+# that single read-only copy instead of loading its own, and gets an
+# equal share of the min_depth cache budget.
+#
+# simulate_prefix_shared plays every target at once by walking the
+# solver's decision tree: targets that share a history share the
+# solver call, so the work scales with distinct nodes, not targets.
+#
+# With --results, every game is appended to a CSV or JSON lines file
+# (by extension) as it ends, with its guesses and the solver's time per
+# turn; --resume skips the targets already in the file.
+#
+#     python simulation.py --workers 16 --first-guess abode
+#     python simulation.py --results games.jsonl --resume
+#     python simulation.py --prefix-sharing --first-guess abode
+
+import csv
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+_words = None
+
+def _init_worker(words, shm_name, cache_bytes):
+    import wordle_solver as ws
+
+    global _words
+    _words = words
+    ws.attach_worker(words, shm_name, cache_bytes)
+    # simulate_single_game reports every turn; keep worker output quiet
+    sys.stdout = open(os.devnull, "w")
+
+
+def _play(args):
+    import wordle_solver_new
+
+    target, first_guess = args
+    turns = []
+    start = time.perf_counter()
+    attempts = wordle_solver_new.simulate_single_game(target, first_guess, _words, turns)
+    return target, attempts, time.perf_counter() - start, turns
+
+
+def latency_summary(latencies):
+    if not latencies:
+        return {}
+    ms = np.array(latencies) * 1000
+    return {
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "max_ms": float(ms.max()),
+    }
+
+
+def simulate_parallel(
+    first_guess="abode",
+    targets=None,
+    workers=None,
+    words_file="words.txt",
+    progress_every=100,
+    writer=None,
+):
+    """
+    writer : optional ResultsWriter, given every game as it ends
+    returns: ({target: attempts}, {target: seconds}); attempts is 7
+    for a target not solved within six guesses
+    """
+    import wordle_solver as ws
+
+    words = ws.load_words(words_file)
+    index = ws.word_index_for(words)
+    targets = list(words if targets is None else targets)
+
+    results = {}
+    latencies = {}
+    shm = index.share()
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(index.words, shm.name, ws.worker_cache_bytes(workers)),
+        ) as pool:
+            jobs = ((target, first_guess) for target in targets)
+            for target, attempts, seconds, turns in pool.map(_play, jobs, chunksize=4):
+                results[target] = attempts
+                latencies[target] = seconds
+                if writer is not None:
+                    writer.write(target, attempts, turns)
+
+                done = len(results)
+                if progress_every and (done % progress_every == 0 or done == len(targets)):
+                    elapsed = time.perf_counter() - start
+                    rate = done / elapsed
+                    eta = (len(targets) - done) / rate
+                    print(
+                        f"[{done}/{len(targets)}] {rate:.1f} games/s,"
+                        f" eta {eta:.0f}s", flush=True
+                    )
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return results, latencies
+
+
+# ------------------------------------------------------------
+# Streaming results
+# ------------------------------------------------------------
+
+RESULT_FIELDS = ["target", "attempts", "guesses", "turn_seconds"]
+
+
+class ResultsWriter:
+    """
+    Append-only game results, one line per game flushed as it ends: CSV
+    for a path ending in .csv (guesses and turn_seconds space
+    separated), JSON lines otherwise. turn_seconds[i] is the solver
+    time that chose guesses[i]; 0 for the opener.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.csv = path.endswith(".csv")
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new:
+            _drop_partial_line(path)
+        self._file = open(path, "a", newline="")
+        if self.csv:
+            self._csv = csv.writer(self._file, lineterminator="\n")
+            if new:
+                self._csv.writerow(RESULT_FIELDS)
+
+    def write(self, target, attempts, turns):
+        guesses = [g for g, _ in turns]
+        seconds = [round(t, 6) for _, t in turns]
+        if self.csv:
+            self._csv.writerow([
+                target, attempts, " ".join(guesses), " ".join(map(str, seconds)),
+            ])
+        else:
+            record = dict(zip(RESULT_FIELDS, (target, attempts, guesses, seconds)))
+            self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _complete_lines(data):
+    # a crash can leave the last line cut short, even mid-number
+    return data[:data.rfind("\n") + 1]
+
+
+def _drop_partial_line(path):
+    with open(path, "r+", newline="") as f:
+        data = f.read()
+        complete = _complete_lines(data)
+        if complete != data:
+            f.seek(len(complete.encode()))
+            f.truncate()
+
+
+def read_results(path):
+    """{target: record} from a ResultsWriter file, skipping broken lines"""
+    records = {}
+    try:
+        with open(path, newline="") as f:
+            lines = _complete_lines(f.read()).splitlines()
+    except FileNotFoundError:
+        return records
+    if path.endswith(".csv"):
+        for row in csv.DictReader(lines):
+            try:
+                record = {
+                    "target": row["target"],
+                    "attempts": int(row["attempts"]),
+                    "guesses": row["guesses"].split(),
+                    "turn_seconds": [float(t) for t in row["turn_seconds"].split()],
+                }
+            except (TypeError, ValueError, AttributeError):
+                continue
+            if len(record["turn_seconds"]) == len(record["guesses"]):
+                records[record["target"]] = record
+    else:
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            records[record["target"]] = record
+    return records
+
+
+def results_summary(records):
+    """guess-count histogram, failures and solver latency per turn"""
+    records = list(records)
+    attempts = Counter(r["attempts"] for r in records)
+    per_turn = {}
+    for r in records:
+        # the opener is not a solver turn
+        for turn, seconds in enumerate(r["turn_seconds"][1:], 2):
+            per_turn.setdefault(turn, []).append(seconds)
+    return {
+        "games": len(records),
+        "histogram": dict(sorted(attempts.items())),
+        "average": sum(k * n for k, n in attempts.items()) / len(records) if records else 0.0,
+        "failures": sorted(r["target"] for r in records if r["attempts"] > 6),
+        "turn_latency": {turn: latency_summary(per_turn[turn]) for turn in sorted(per_turn)},
+    }
+
+
+def print_summary(summary):
+    print(f"{summary['games']} games, average {summary['average']:.4f} guesses")
+    print("guesses  games")
+    for attempts, n in summary["histogram"].items():
+        label = "fail" if attempts > 6 else str(attempts)
+        print(f"{label:>7s}  {n}")
+    failures = summary["failures"]
+    print(f"failed: {len(failures)}", " ".join(failures[:20]))
+    for turn, lat in summary["turn_latency"].items():
+        print(f"turn {turn} solver latency:",
+              " ".join(f"{k} {lat[k]:.1f}" for k in ("p50_ms", "p95_ms", "p99_ms", "max_ms")))
+
+
+# ------------------------------------------------------------
+# Prefix-sharing engine
+# ------------------------------------------------------------
+
+def simulate_prefix_shared(first_guess="abode", targets=None, words=None, solver="wordle_solver_new"):
+    """
+    Same results as simulate_single_game for every target, from a
+    single traversal of the decision tree.
+
+    returns: ({target: attempts}, number of solver calls made)
+    """
+    import importlib
+
+    import wordle_solver as ws
+    from feedback_matrix import ALL_GREEN
+
+    module = importlib.import_module(solver)
+    words = ws.load_words("words.txt") if words is None else words
+    index = ws.word_index_for(words)
+    matrix = index.matrix
+    targets = words if targets is None else targets
+
+    results = {}
+    calls = 0
+
+    # mirrors simulate_single_game: depth_left is 6 for the opener's
+    # feedback and a guess made with depth_left 1 is never played
+    stack = [(ws.state_of(words), index.position[first_guess], 6, ws.state_of(targets))]
+    while stack:
+        possible, guess, depth_left, group = stack.pop()
+        codes = matrix[guess, group]
+        for code in np.unique(codes).tolist():
+            members = group[codes == code]
+            if code == ALL_GREEN:
+                for t in members.tolist():
+                    results[index.words[t]] = 7 - depth_left
+                continue
+            if depth_left == 1:
+                for t in members.tolist():
+                    results[index.words[t]] = 7
+                continue
+
+            bucket = ws.filter_by_feedback(possible, guess, code)
+            next_guess = module.optimal_word(ws.words_of(bucket), depth_left)
+            calls += 1
+            if next_guess is None:
+                # no guess is sure to win in the guesses left: a
+                # failed bucket, not a crash
+                for t in members.tolist():
+                    results[index.words[t]] = 7
+                continue
+            stack.append((bucket, index.position[next_guess], depth_left - 1, members))
+
+    return {t: results[t] for t in targets}, calls
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulate games for every target in parallel.")
+    parser.add_argument("--first-guess", default="abode")
+    parser.add_argument("--workers", type=int, default=None, help="default: one per CPU")
+    parser.add_argument("--words-file", default="words.txt")
+    parser.add_argument("--limit", type=int, help="only the first N targets")
+    parser.add_argument("--output", default="simulation_results.txt")
+    parser.add_argument("--results", metavar="FILE",
+                        help="append every game, with its guesses and solver time per turn,"
+                        " to FILE as it ends (.csv or .jsonl)")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip the targets already in --results")
+    parser.add_argument("--prefix-sharing", action="store_true",
+                        help="one pass over the decision tree instead of one game per target")
+    args = parser.parse_args()
+    if args.resume and not args.results:
+        parser.error("--resume needs --results")
+    if args.results and args.prefix_sharing:
+        parser.error("--results records per-game runs; drop --prefix-sharing")
+
+    import wordle_solver as ws
+
+    words = ws.load_words(args.words_file)
+    targets = words[:args.limit]
+    done = {}
+    if args.results:
+        if not args.resume and os.path.exists(args.results) and os.path.getsize(args.results):
+            parser.error(f"{args.results} already has results; pass --resume to continue it")
+        done = read_results(args.results)
+        if any(r["guesses"][:1] != [args.first_guess] for r in done.values()):
+            parser.error(f"{args.results} has games with another first guess")
+        print(f"{len(done)} games already in {args.results}")
+        targets = [t for t in targets if t not in done]
+
+    start = time.perf_counter()
+    if args.prefix_sharing:
+        results, calls = simulate_prefix_shared(args.first_guess, targets, words)
+        latencies = {}
+        print(f"{calls} solver calls for {len(targets)} targets")
+    elif args.results:
+        with ResultsWriter(args.results) as writer:
+            results, latencies = simulate_parallel(
+                args.first_guess, targets, args.workers, args.words_file, writer=writer
+            )
+    else:
+        results, latencies = simulate_parallel(
+            args.first_guess, targets, args.workers, args.words_file
+        )
+    elapsed = time.perf_counter() - start
+    print(f"{len(results)} games in {elapsed:.1f}s ({len(results) / max(elapsed, 1e-9):.1f} games/s)")
+
+    if args.results:
+        records = read_results(args.results)
+        results = {t: records[t]["attempts"] for t in words[:args.limit] if t in records}
+
+    # same format as wordle_solver_new.simulate_game
+    with open(args.output, "w") as f:
+        for word, attempts in results.items():
+            f.write(f"{word}: {attempts}\n")
+
+    if args.results:
+        print_summary(results_summary(records[t] for t in results))
+    else:
+        failed = [w for w, attempts in results.items() if attempts > 6]
+        if latencies:
+            print("per-game latency:", {k: round(v, 1) for k, v in latency_summary(list(latencies.values())).items()})
+        print(f"failed: {len(failed)}", " ".join(failed[:20]))
+    print("results written to", args.output)
@@ -0,0 +1,218 @@
+# ============================================================
+# Long-running solver service
+# ============================================================
+#
+# Keeps the word list, feedback matrix, opening books and min_depth
+# caches warm across turns, and keeps each game's candidates in a
+# session instead of possible_words.txt. Requests and responses are
+# one JSON object per line, over stdin/stdout or a Unix socket:
+#
+#   {"session": "s1", "guess": "abode", "feedback": "BYBBB"}
+#   -> {"session": "s1", "attempts": 1, "next_guess": "...",
+#       "remaining": 12, "remaining_words": [...], "ms": 3.1}
+#
+#   {"session": "s1", "op": "end"}    forget a session
+#   {"op": "stats"}                   sessions and cache statistics
+#   {"op": "batch", "histories": [[["abode", "BYBBB"]], ...]}
+#   -> {"next_guesses": [...]}        stateless, one per history of
+#                                     1 to 6 [guess, feedback] steps
+#
+# A turn may carry "time_budget" (seconds) to get the best guess found
+# in time, with "proven" telling whether it is optimal (wordle_solver
+# only). A request without a session is answered from the full list.
+#
+#     python solver_daemon.py
+#     python solver_daemon.py --socket /tmp/wordle.sock
+
+import importlib
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import wordle_solver as ws
+from constraint_index import valid_step
+
+
+MAX_SESSIONS = 10000
+MAX_GUESSES = 6
+
+
+class Session:
+    def __init__(self, state):
+        self.state = state
+        self.history = []
+
+
+class SolverService:
+    def __init__(self, words, solver="wordle_solver", max_sessions=MAX_SESSIONS):
+        self.words = words
+        self.solver = importlib.import_module(solver)
+        self.max_sessions = max_sessions
+        self.sessions = OrderedDict()
+        # the solver's caches are module globals: one request at a time
+        self.lock = threading.Lock()
+
+    def session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = Session(ws.state_of(self.words))
+            if len(self.sessions) > self.max_sessions:
+                # drop the least recently played game
+                self.sessions.popitem(last=False)
+        else:
+            self.sessions.move_to_end(session_id)
+        return session
+
+    def handle(self, request):
+        start = time.perf_counter()
+        with self.lock:
+            try:
+                response = self._handle(request)
+            except (KeyError, ValueError, TypeError) as e:
+                response = {"error": str(e)}
+        if "session" in request:
+            response["session"] = request["session"]
+        response["ms"] = round((time.perf_counter() - start) * 1000, 3)
+        return response
+
+    def _handle(self, request):
+        op = request.get("op", "turn")
+        if op == "end":
+            return {"ended": self.sessions.pop(request["session"], None) is not None}
+        if op == "stats":
+            return {"sessions": len(self.sessions), "cache": ws.min_depth_cache_stats()}
+        if op == "batch":
+            histories = [self._history(h) for h in request["histories"]]
+            return {"next_guesses": ws.solve_batch(histories, self.solver.__name__)}
+        if op != "turn":
+            raise ValueError(f"unknown op {op!r}")
+
+        guess = request["guess"]
+        fb = request["feedback"]
+        if guess not in ws.word_index_for(self.words).position:
+            raise ValueError(f"{guess!r} is not in the word list")
+        if len(fb) != 5 or set(fb) - set("GYB"):
+            raise ValueError(f"bad feedback {fb!r}, expected e.g. BGYBB")
+
+        session_id = request.get("session")
+        if session_id is None:
+            session = Session(ws.state_of(self.words))
+        else:
+            session = self.session(session_id)
+        if len(session.history) >= MAX_GUESSES:
+            raise ValueError(f"the game is over after {MAX_GUESSES} guesses")
+
+        state = ws.filter_by_feedback(
+            session.state, ws.word_index_for(self.words).position[guess], ws.pattern_code(fb)
+        )
+        if not len(state):
+            # leave the session as it was, the turn was mistyped
+            raise ValueError("no word matches this feedback")
+        session.state = state
+        session.history.append((guess, fb))
+        attempts = len(session.history)
+        remaining = ws.words_of(state)
+        response = {
+            "attempts": attempts,
+            "remaining": len(remaining),
+            "remaining_words": list(remaining),
+        }
+        if fb == "GGGGG":
+            self.sessions.pop(session_id, None)
+            return dict(response, solved=True)
+
+        depth_left = 6 - attempts
+        budget = request.get("time_budget")
+        if budget is not None and self.solver is ws:
+            next_guess, proven = ws.optimal_word(remaining, depth_left, time.monotonic() + budget)
+            return dict(response, next_guess=next_guess, proven=proven)
+        return dict(response, next_guess=self.solver.optimal_word(remaining, depth_left))
+
+    @staticmethod
+    def _history(steps):
+        # an empty history would search the whole list under the lock
+        if not isinstance(steps, list) or not 1 <= len(steps) <= MAX_GUESSES:
+            raise ValueError(f"a history needs 1 to {MAX_GUESSES} steps")
+        history = []
+        for step in steps:
+            if not isinstance(step, list) or len(step) != 2 or not valid_step(*step):
+                raise ValueError(f"bad history step {step!r}, expected [guess, GYBBB]")
+            history.append(tuple(step))
+        return history
+
+
+# ------------------------------------------------------------
+# Transports
+# ------------------------------------------------------------
+
+def handle_line(service, line):
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+    except ValueError as e:
+        return {"error": f"bad request: {e}"}
+    return service.handle(request)
+
+
+def serve_lines(service, infile, outfile):
+    for line in infile:
+        if line.strip():
+            outfile.write(json.dumps(handle_line(service, line)) + "\n")
+            outfile.flush()
+
+
+def serve_socket(service, path):
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if line.strip():
+                    response = handle_line(service, line)
+                    self.wfile.write(json.dumps(response).encode() + b"\n")
+
+    if os.path.exists(path):
+        os.unlink(path)
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+        server.daemon_threads = True
+        print(f"listening on {path}", file=sys.stderr, flush=True)
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve solver turns as JSON lines.")
+    parser.add_argument("--socket", help="listen on this Unix socket instead of stdin/stdout")
+    parser.add_argument("--words-file", default="words.txt")
+    parser.add_argument("--solver", default="wordle_solver",
+                        choices=["wordle_solver", "wordle_solver_new"])
+    parser.add_argument(
+        "--store", nargs="?", const=ws.DEFAULT_STORE_PATH, default=None,
+        help="also use the on-disk cache shared by all runs",
+    )
+    parser.add_argument("--book", help="opening book to consult first"
+                        " (default: every book built by opening_book.py)")
+    args = parser.parse_args()
+
+    words = ws.load_words(args.words_file)
+    # build or map the matrix before the first request
+    ws.word_index_for(words).matrix
+    if args.store:
+        ws.use_solver_store(args.store)
+    if args.book:
+        ws.use_opening_book(args.book)
+    else:
+        ws.use_built_opening_books()
+
+    service = SolverService(words, args.solver)
+    if args.socket:
+        serve_socket(service, args.socket)
+    else:
+        serve_lines(service, sys.stdin, sys.stdout)
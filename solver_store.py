@@ -0,0 +1,147 @@
+# ============================================================
+# Persistent on-disk solver cache (SQLite)
+# ============================================================
+#
+# Stores proven min_depth bounds and optimal_word answers so that a
+# fresh CLI process starts warm. Rows are keyed by the hash of the word
+# list plus a digest of the state key, so caches for different word
+# lists never mix. The database runs in WAL mode: any number of
+# processes can read while one writes.
+#
+# Writes are buffered and committed in batches; call flush() (the
+# solver registers it atexit) to make them visible to other processes.
+
+import hashlib
+import os
+
+from feedback_matrix import CACHE_DIR
+from lazy_import import lazy_import
+
+sqlite3 = lazy_import("sqlite3")
+
+
+DEFAULT_STORE_PATH = os.path.join(CACHE_DIR, "solver.sqlite3")
+
+# stand-in for an unknown (infinite) upper bound: SQLite's min()
+# returns NULL if either argument is NULL
+INF_DEPTH = 255
+
+FLUSH_EVERY = 1000
+
+
+def state_digest(state):
+    return hashlib.blake2b(state, digest_size=16).digest()
+
+
+class SolverStore:
+    def __init__(self, list_hash, path=DEFAULT_STORE_PATH):
+        self.list_hash = list_hash
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(path, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS bounds ("
+            " list_hash TEXT, state BLOB, lower INTEGER, upper INTEGER,"
+            " PRIMARY KEY (list_hash, state)) WITHOUT ROWID"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            " list_hash TEXT, solver TEXT, state BLOB, depth_left INTEGER,"
+            " guess TEXT,"
+            " PRIMARY KEY (list_hash, solver, state, depth_left)) WITHOUT ROWID"
+        )
+        self._db.commit()
+        self._pending_bounds = {}
+        self._pending_answers = {}
+
+    # ------------------------------------------------------------
+    # min_depth bounds: (lower, upper), upper may be inf
+    # ------------------------------------------------------------
+
+    def get_bounds(self, state):
+        digest = state_digest(state)
+        bounds = self._pending_bounds.get(digest)
+        if bounds is not None:
+            return bounds
+
+        row = self._db.execute(
+            "SELECT lower, upper FROM bounds WHERE list_hash = ? AND state = ?",
+            (self.list_hash, digest),
+        ).fetchone()
+        if row is None:
+            return None
+        lower, upper = row
+        return lower, float("inf") if upper >= INF_DEPTH else upper
+
+    def put_bounds(self, state, lower, upper):
+        self._pending_bounds[state_digest(state)] = (lower, upper)
+        self._maybe_flush()
+
+    # ------------------------------------------------------------
+    # optimal_word answers, per solver: the entry points pick guesses
+    # differently and must not serve each other's answers. The solver
+    # name carries its version (see wordle_solver.store_solver_name),
+    # so answers of an older version are never found.
+    # ------------------------------------------------------------
+
+    def get_answer(self, solver, state, depth_left):
+        key = (solver, state_digest(state), depth_left)
+        guess = self._pending_answers.get(key)
+        if guess is not None:
+            return guess
+
+        row = self._db.execute(
+            "SELECT guess FROM answers WHERE list_hash = ?"
+            " AND solver = ? AND state = ? AND depth_left = ?",
+            (self.list_hash,) + key,
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def put_answer(self, solver, state, depth_left, guess):
+        self._pending_answers[(solver, state_digest(state), depth_left)] = guess
+        self._maybe_flush()
+
+    # ------------------------------------------------------------
+
+    def _maybe_flush(self):
+        if len(self._pending_bounds) + len(self._pending_answers) >= FLUSH_EVERY:
+            self.flush()
+
+    def flush(self):
+        if not self._pending_bounds and not self._pending_answers:
+            return
+        with self._db:
+            # bounds from other processes are merged, never loosened
+            self._db.executemany(
+                "INSERT INTO bounds VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (list_hash, state) DO UPDATE SET"
+                " lower = max(lower, excluded.lower),"
+                " upper = min(upper, excluded.upper)",
+                [
+                    (self.list_hash, digest, lower, min(upper, INF_DEPTH))
+                    for digest, (lower, upper) in self._pending_bounds.items()
+                ],
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?)",
+                [
+                    (self.list_hash,) + key + (guess,)
+                    for key, guess in self._pending_answers.items()
+                ],
+            )
+        self._pending_bounds.clear()
+        self._pending_answers.clear()
+
+    def rebind(self, list_hash):
+        """Switch to another word list; pending rows are written first."""
+        self.flush()
+        self.list_hash = list_hash
+
+    def close(self):
+        self.flush()
+        self._db.close()
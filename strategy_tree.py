@@ -0,0 +1,271 @@
+# ============================================================
+# Compiled strategy tree
+# ============================================================
+#
+# The complete decision tree the solver plays from a fixed opener:
+# node 0 guesses the opener, and each node's child for feedback code c
+# is the node reached after that feedback. Serving a turn is then a
+# walk of at most six nodes instead of a search.
+#
+# File layout (little endian), memory-mapped on load:
+#
+#   8 bytes   magic b"WWTREE1\0"
+#   4 bytes   uint32 length of the JSON header
+#   n bytes   JSON header (opener, solver, solver_version, list_hash,
+#             node count), padded with spaces to a multiple of 8
+#   nodes     NODE_DTYPE records: guess (uint16 word position),
+#             turn (uint8, 1 for the opener), children (int32[243],
+#             -1 where no candidate gives that feedback, -2 where the
+#             solver found no guess sure to win in the guesses left)
+#
+#     python strategy_tree.py compile --opener abode
+#     python strategy_tree.py verify --opener abode
+#     python strategy_tree.py query abode:BYBBB,sarin:BGBBB
+
+import os
+
+import numpy as np
+
+from constraint_index import parse_history
+from feedback_matrix import ALL_GREEN, CACHE_DIR, PATTERN_COUNT, pattern_code
+from file_io import atomic_write, pack_header, read_header
+
+
+MAGIC = b"WWTREE1\0"
+MAX_GUESSES = 6
+# child of a bucket the solver has no guess for: its targets are failures
+UNSOLVED = -2
+
+NODE_DTYPE = np.dtype([
+    ("guess", "<u2"),
+    ("turn", "u1"),
+    ("children", "<i4", (PATTERN_COUNT,)),
+])
+
+
+def tree_path(opener, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"strategy_tree_{opener}.bin")
+
+
+# ------------------------------------------------------------
+# Compiler
+# ------------------------------------------------------------
+
+def compile_tree(words, opener, solver="wordle_solver"):
+    """
+    Play the solver module's optimal_word from opener against every
+    bucket, recursively, and record each decision as a node.
+    """
+    import importlib
+
+    import wordle_solver as ws
+
+    module = importlib.import_module(solver)
+    index = ws.word_index_for(words)
+    position = index.position
+    guesses, turns, children = [], [], []
+
+    def build(state, guess, turn):
+        node = len(guesses)
+        guesses.append(guess)
+        turns.append(turn)
+        row = np.full(PATTERN_COUNT, -1, dtype=np.int32)
+        children.append(row)
+        if turn >= MAX_GUESSES:
+            return node
+
+        for code, bucket in ws.partition_codes(state, guess):
+            if code == ALL_GREEN:
+                continue
+            next_guess = module.optimal_word(ws.words_of(bucket), MAX_GUESSES - turn)
+            if next_guess is None:
+                row[code] = UNSOLVED
+            else:
+                row[code] = build(bucket, position[next_guess], turn + 1)
+        return node
+
+    build(ws.state_of(words), position[opener], 1)
+
+    nodes = np.zeros(len(guesses), dtype=NODE_DTYPE)
+    nodes["guess"] = guesses
+    nodes["turn"] = turns
+    nodes["children"] = np.array(children)
+    header = {
+        "opener": opener,
+        "solver": solver,
+        "solver_version": ws.solver_version(solver),
+        "list_hash": index.list_hash,
+        "nodes": len(guesses),
+    }
+    return StrategyTree(header, nodes, index.words)
+
+
+# ------------------------------------------------------------
+# Tree: query and verification
+# ------------------------------------------------------------
+
+class StrategyTree:
+    def __init__(self, header, nodes, words):
+        self.header = header
+        self.nodes = nodes
+        self.words = words
+        self.position = {w: i for i, w in enumerate(words)}
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @property
+    def opener(self):
+        return self.header["opener"]
+
+    def node_for(self, history):
+        """
+        history: [(guess, feedback_string), ...] played so far.
+        returns: node index after history, UNSOLVED if the solver had
+        no guess there, or None if the history leaves the tree (another
+        guess was played or feedback is impossible).
+        """
+        node = 0
+        for guess, fb in history:
+            if node < 0 or self.words[self.nodes["guess"][node]] != guess:
+                return None
+            node = int(self.nodes["children"][node, pattern_code(fb)])
+        return node if node >= 0 or node == UNSOLVED else None
+
+    def next_guess(self, history):
+        node = self.node_for(history)
+        if node is None or node == UNSOLVED:
+            return None
+        return self.words[self.nodes["guess"][node]]
+
+    def solve(self, target):
+        """Guesses the tree plays against target (stops at 6)."""
+        import wordle_solver as ws
+
+        matrix = ws.word_index_for(self.words).matrix
+        t = self.position[target]
+        played = []
+        node = 0
+        while node >= 0 and len(played) < MAX_GUESSES:
+            guess = int(self.nodes["guess"][node])
+            played.append(self.words[guess])
+            if guess == t:
+                break
+            node = int(self.nodes["children"][node, matrix[guess, t]])
+        return played
+
+    def verify(self, targets=None):
+        """
+        returns: (histogram {guesses: count}, failed targets); a target
+        fails when the tree does not reach it within 6 guesses.
+        """
+        targets = self.words if targets is None else targets
+        histogram = {}
+        failed = []
+        for target in targets:
+            played = self.solve(target)
+            if played and played[-1] == target:
+                histogram[len(played)] = histogram.get(len(played), 0) + 1
+            else:
+                failed.append(target)
+        return dict(sorted(histogram.items())), failed
+
+    # ------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------
+
+    def save(self, path):
+        with atomic_write(path) as f:
+            f.write(pack_header(MAGIC, self.header))
+            f.write(np.ascontiguousarray(self.nodes).tobytes())
+
+
+def load_tree(path, words):
+    """
+    Memory-map a compiled tree; words must be the list it was built
+    from, and the solver must not have changed version since.
+    """
+    import wordle_solver as ws
+    from feedback_matrix import word_list_hash
+
+    with open(path, "rb") as f:
+        found = read_header(f, MAGIC)
+    if found is None:
+        raise ValueError(f"{path} is not a strategy tree file")
+    header, offset = found
+
+    if header["list_hash"] != word_list_hash(words):
+        raise ValueError(f"{path} was compiled for a different word list")
+    # trees compiled before versions were recorded have none: recompile
+    if header.get("solver_version") != ws.solver_version(header["solver"]):
+        raise ValueError(
+            f"{path} was compiled by another version of {header['solver']}; compile it again"
+        )
+
+    nodes = np.memmap(
+        path, dtype=NODE_DTYPE, mode="r",
+        offset=offset, shape=(header["nodes"],),
+    )
+    return StrategyTree(header, nodes, tuple(words))
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description="Compile, verify or query a strategy tree.")
+    parser.add_argument("command", choices=["compile", "verify", "query"])
+    parser.add_argument("history", nargs="?", help="for query: abode:BGYBB,cairn:GGBBY")
+    parser.add_argument("--opener", default="abode")
+    parser.add_argument("--words-file", default="words.txt")
+    parser.add_argument("--solver", default="wordle_solver",
+                        choices=["wordle_solver", "wordle_solver_new"])
+    parser.add_argument("--tree", help="default: .wordle_cache/strategy_tree_<opener>.bin")
+    args = parser.parse_args()
+
+    import wordle_solver as ws
+
+    words = ws.load_words(args.words_file)
+
+    def load(opener):
+        try:
+            return load_tree(args.tree or tree_path(opener), words)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+
+    if args.command == "compile":
+        start = time.time()
+        tree = compile_tree(words, args.opener, args.solver)
+        path = args.tree or tree_path(args.opener)
+        tree.save(path)
+        print(f"compiled {len(tree)} nodes in {time.time() - start:.1f}s -> {path}")
+        sys.exit(0)
+
+    if args.command == "query":
+        if not args.history:
+            parser.error("query needs a history, e.g. abode:BGYBB")
+        history = parse_history(args.history)
+        opener = history[0][0]
+        tree = load(opener)
+        node = tree.node_for(history)
+        if node is None:
+            print("history is not in the tree")
+            sys.exit(1)
+        if node == UNSOLVED:
+            print("next optimal guess: None (no guess is sure to win in the guesses left)")
+            sys.exit(1)
+        guess = tree.next_guess(history)
+        print("next optimal guess:", guess)
+        sys.exit(0)
+
+    tree = load(args.opener)
+    histogram, failed = tree.verify()
+    solved = sum(histogram.values())
+    average = sum(k * v for k, v in histogram.items()) / solved if solved else 0.0
+    print(f"{len(tree)} nodes, opener {tree.opener}")
+    print("guesses:", histogram, f"average {average:.3f}")
+    if failed:
+        print(f"FAILED {len(failed)} targets:", " ".join(failed[:20]))
+        sys.exit(1)
+    print(f"all {solved} targets solved within {MAX_GUESSES} guesses")
@@ -0,0 +1,67 @@
+# ConstraintIndex.filter against checking feedback() for every word
+
+import os
+import random
+from collections import defaultdict
+from itertools import product
+
+import pytest
+
+from constraint_index import ConstraintIndex
+from wordle_solver import feedback
+
+
+WORDS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "words.txt")
+
+with open(WORDS_FILE) as f:
+    WORDS = tuple(f.read().split())
+
+ALL_FEEDBACK = ["".join(fb) for fb in product("GYB", repeat=5)]
+
+# repeated letters, letters the list never has at a position, and
+# words that are not in the list at all
+GUESSES = ["abode", "crane", "eerie", "mamma", "llama", "geese", "xyzzy", "qajaq", "aaaaa", "zzzzb"]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return ConstraintIndex.for_words(WORDS)
+
+
+def brute_force(history):
+    return [i for i, w in enumerate(WORDS) if all(feedback(g, w) == fb for g, fb in history)]
+
+
+@pytest.mark.parametrize("guess", GUESSES)
+def test_every_feedback_for_one_guess(index, guess):
+    # feedback the scoring never produces (a yellow after a black of
+    # the same letter, ...) must match no word
+    buckets = defaultdict(list)
+    for i, w in enumerate(WORDS):
+        buckets[feedback(guess, w)].append(i)
+    for fb in ALL_FEEDBACK:
+        assert index.filter([(guess, fb)]).tolist() == buckets.get(fb, []), fb
+
+
+def test_histories_from_real_games(index):
+    rng = random.Random(0)
+    for _ in range(200):
+        target = rng.choice(WORDS)
+        guesses = [rng.choice(WORDS) for _ in range(rng.randint(1, 4))]
+        # one guess outside the list now and then
+        if rng.random() < 0.3:
+            guesses.append("".join(rng.choice("abcdeilnorstu") for _ in range(5)))
+        history = [(g, feedback(g, target)) for g in guesses]
+        assert index.filter(history).tolist() == brute_force(history)
+
+
+def test_histories_with_impossible_turns(index):
+    rng = random.Random(1)
+    for _ in range(100):
+        history = [(rng.choice(GUESSES + list(WORDS[:50])), rng.choice(ALL_FEEDBACK))
+                   for _ in range(rng.randint(1, 3))]
+        assert index.filter(history).tolist() == brute_force(history)
+
+
+def test_empty_history_keeps_every_word(index):
+    assert index.filter([]).tolist() == list(range(len(WORDS)))
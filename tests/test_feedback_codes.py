@@ -0,0 +1,59 @@
+# Vectorized feedback codes against the plain feedback() reference
+
+import os
+import random
+from itertools import product
+
+import numpy as np
+import pytest
+
+from feedback_matrix import PATTERN_STRINGS, compute_feedback_matrix
+from wordle_solver import feedback
+
+
+WORDS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "words.txt")
+
+with open(WORDS_FILE) as f:
+    WORDS = tuple(f.read().split())
+
+REPEATED = tuple(w for w in WORDS if len(set(w)) < 5)
+
+
+def assert_matches(guesses, targets):
+    matrix = compute_feedback_matrix(targets, guesses)
+    assert matrix.shape == (len(guesses), len(targets))
+    for g, guess in enumerate(guesses):
+        got = [PATTERN_STRINGS[c] for c in matrix[g].tolist()]
+        assert got == [feedback(guess, t) for t in targets], guess
+
+
+@pytest.mark.parametrize("letters", ["ab", "abc"])
+def test_every_word_over_a_small_alphabet(letters):
+    # every way a letter can repeat in guess and target, against every other
+    words = ["".join(p) for p in product(letters, repeat=5)]
+    assert_matches(words, words)
+
+
+def test_repeated_letter_words():
+    guesses = random.Random(0).sample(REPEATED, 150)
+    assert_matches(guesses, REPEATED)
+
+
+def test_random_pairs():
+    rng = random.Random(1)
+    assert_matches(rng.sample(WORDS, 200), rng.sample(WORDS, 1000))
+
+
+def test_guesses_outside_the_list():
+    rng = random.Random(2)
+    guesses = ["".join(rng.choice("aeeilnorsst") for _ in range(5)) for _ in range(200)]
+    guesses += ["eeeee", "sassy", "qqqqq"]
+    targets = rng.sample(WORDS, 500)
+    assert_matches(guesses, targets)
+
+
+def test_square_matrix_is_guesses_by_targets():
+    words = WORDS[::40]
+    matrix = compute_feedback_matrix(words)
+    assert np.array_equal(matrix, compute_feedback_matrix(words, words))
+    assert_matches(words[:30], words)
@@ -0,0 +1,91 @@
+# FeedbackRows against the eager matrix of the same words
+
+import os
+
+import numpy as np
+import pytest
+
+from feedback_matrix import FeedbackRows, WordIndex, compute_feedback_matrix, guess_stats
+
+
+WORDS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "words.txt")
+
+with open(WORDS_FILE) as f:
+    WORDS = tuple(f.read().split()[::15])
+
+EAGER = compute_feedback_matrix(WORDS)
+N = len(WORDS)
+
+
+def requests(seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(40):
+        guesses = rng.choice(N, rng.integers(1, 40))
+        cols = rng.choice(N, rng.integers(1, 60), replace=False)
+        yield guesses, cols
+
+
+@pytest.mark.parametrize("max_bytes", [1 << 30, 10 * N, N])
+@pytest.mark.parametrize("spill", [False, True])
+def test_indexing_matches_eager(tmp_path, max_bytes, spill):
+    rows = FeedbackRows(WORDS, max_bytes, str(tmp_path / "spill.bin") if spill else None)
+    for guesses, cols in requests():
+        g = int(guesses[0])
+        assert np.array_equal(rows[g], EAGER[g])
+        assert np.array_equal(rows[g, cols], EAGER[g, cols])
+        assert np.array_equal(rows[guesses], EAGER[guesses])
+        assert np.array_equal(rows[guesses, cols], EAGER[guesses][:, cols])
+        mask = np.zeros(N, dtype=bool)
+        mask[cols] = True
+        assert np.array_equal(rows[guesses, mask], EAGER[guesses][:, mask])
+        assert rows.nbytes <= max(max_bytes, N)
+    assert np.array_equal(rows[5:40:3], EAGER[5:40:3])
+
+
+def test_eviction_keeps_most_recent_rows():
+    rows = FeedbackRows(WORDS, max_bytes=3 * N)
+    for g in (0, 1, 2, 3):
+        rows.row(g)
+    rows.row(1)
+    rows.row(4)
+    assert list(rows._rows) == [3, 1, 4]
+    assert rows.info()["misses"] == 5 and rows.info()["hits"] == 1
+
+
+def test_spilled_rows_are_read_back(tmp_path):
+    rows = FeedbackRows(WORDS, max_bytes=2 * N, spill_path=str(tmp_path / "spill.bin"))
+    for g in range(10):
+        rows.row(g)
+    computed = rows.computed
+    for g in range(10):
+        assert np.array_equal(rows[g], EAGER[g])
+    assert rows.computed == computed
+    assert rows.spill_reads >= 8
+    assert np.array_equal(rows[np.arange(10), np.arange(0, N, 7)], EAGER[:10, ::7])
+
+
+def test_block_computes_only_missing_rows():
+    rows = FeedbackRows(WORDS)
+    rows.row(3)
+    assert np.array_equal(rows[[3, 7], [1, 2, 3]], EAGER[[3, 7]][:, [1, 2, 3]])
+    # the partial row of 7 is not kept
+    assert list(rows._rows) == [3] and rows.computed == 1
+
+
+def test_copy_to_and_guess_stats():
+    rows = FeedbackRows(WORDS, max_bytes=N)
+    out = np.empty((N, N), dtype=np.uint8)
+    rows.copy_to(out)
+    assert np.array_equal(out, EAGER)
+
+    state = np.arange(0, N, 3)
+    for got, want in zip(guess_stats(rows, state, state), guess_stats(EAGER, state, state)):
+        assert np.array_equal(got, want)
+
+
+def test_word_index_rows_match_row():
+    index = WordIndex(WORDS, cache_dir=None)
+    index.use_lazy_rows(max_bytes=4 * N)
+    guesses = [2, 9, 2, 31, 40, 41, 9]
+    assert index.rows(guesses) == [EAGER[g].tobytes() for g in guesses]
+    assert [index.row(g) for g in guesses] == [EAGER[g].tobytes() for g in guesses]
@@ -0,0 +1,105 @@
+# optimal_word with a guess pool against the serial loop
+
+import os
+from multiprocessing import Value
+
+import numpy as np
+import pytest
+
+import guess_pool
+import wordle_solver as ws
+from feedback_matrix import WordIndex
+
+
+WORDS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "words.txt")
+
+with open(WORDS_FILE) as f:
+    WORDS = tuple(f.read().split())
+
+
+@pytest.fixture(scope="module")
+def buckets():
+    """post-abode buckets, largest first, and the guess the serial loop plays"""
+    ws.use_word_index(WordIndex(WORDS, cache_dir=None))
+    state = ws.state_of(WORDS)
+    parts = ws.partition_codes(state, ws._word_index.position["abode"])
+    parts = sorted((b for _, b in parts), key=len, reverse=True)
+    return parts[:8]
+
+
+@pytest.fixture
+def pool():
+    pool = ws.use_guess_pool(2)
+    yield pool
+    pool.close()
+    ws._guess_pool = None
+
+
+def serial(words, depth_left):
+    pool, ws._guess_pool = ws._guess_pool, None
+    try:
+        ws.min_depth_cache_clear()
+        return ws.optimal_word(words, depth_left)
+    finally:
+        ws._guess_pool = pool
+
+
+@pytest.mark.parametrize("depth_left", [5, 4])
+def test_pooled_matches_serial(buckets, pool, depth_left):
+    # depth 5 takes the early stop at a worst case of 4, depth 4 does not
+    for bucket in buckets:
+        words = ws.words_of(bucket)
+        assert ws.optimal_word(words, depth_left) == serial(words, depth_left), len(words)
+
+
+def test_second_turn_buckets(buckets, pool):
+    for bucket in buckets[:3]:
+        words = ws.words_of(bucket)
+        guess = ws._word_index.position[serial(words, 5)]
+        for _, sub in ws.partition_codes(bucket, guess):
+            if len(sub) > 8:
+                sub_words = ws.words_of(sub)
+                assert ws.optimal_word(sub_words, 4) == serial(sub_words, 4)
+
+
+def test_scores_under_exact_below_are_exact(buckets, pool):
+    bucket = buckets[0]
+    guesses = [ws._word_index.position[w] for w in ws.sort_words_by_entropy(ws.words_of(bucket))[:40]]
+    pooled = pool.worst_case_depths(bucket, guesses, 5, exact_below=5)
+    ws.min_depth_cache_clear()
+    exact = [ws.worst_case_depth(bucket, g, 5) for g in guesses]
+    for i, (got, want) in enumerate(zip(pooled, exact)):
+        if got != float("inf"):
+            assert got == want
+        else:
+            # pruned: it cannot beat an earlier guess, nor get under
+            # exact_below where the early stop would take it
+            assert want >= min(exact[:i] + [5])
+    # so the first best guess, the serial loop's answer, is the same
+    assert min(pooled) == min(exact)
+    assert np.argmin(pooled) == np.argmin(exact)
+
+
+def test_pruning_against_the_incumbent(buckets, monkeypatch):
+    # _score in this process, with the incumbent another worker left
+    bucket = buckets[0]
+    ws.min_depth_cache_clear()
+    scored = [
+        (ws.worst_case_depth(bucket, g, 5), g)
+        for g in (ws._word_index.position[w] for w in ws.sort_words_by_entropy(ws.words_of(bucket))[:40])
+    ]
+    score, guess = next((s, g) for s, g in scored if s == 4)
+
+    def run(incumbent_score, incumbent_order, order, exact_below):
+        encoded = incumbent_score * guess_pool.ORDER_SPAN + incumbent_order
+        monkeypatch.setattr(guess_pool, "_incumbent", Value("q", encoded))
+        return guess_pool._score((bucket, guess, order, 5, exact_below))
+
+    # a later guess scoring 3: this earlier 4 is kept exact under
+    # exact_below, where the serial loop would stop at it
+    assert run(3, 10, 0, exact_below=5) == score
+    assert run(3, 10, 0, exact_below=0) == float("inf")
+    # a later guess scoring 4: the tie goes to this earlier one
+    assert run(4, 10, 0, exact_below=0) == score
+    # an earlier guess scoring 4: a tie cannot change the answer
+    assert run(4, 0, 10, exact_below=5) == float("inf")
@@ -0,0 +1,84 @@
+# min_depth against a plain minimax over feedback() strings, with no
+# bounds, move ordering, signatures or cache
+
+import random
+from collections import defaultdict
+from functools import lru_cache
+
+import pytest
+
+import wordle_solver as ws
+from feedback_matrix import WordIndex
+from wordle_solver import feedback
+
+
+WORDS = (
+    "batch bight catch fight hatch latch light match might night "
+    "patch ratch right sight tight watch wight eight"
+).split() + (
+    "bound found hound mound pound round sound wound "
+    "bower cower dower lower mower power rower sower tower vower"
+).split()
+
+STATES = [
+    "batch catch hatch latch match patch ratch watch",
+    "bight fight light might night right sight tight wight",
+    "bound found hound mound pound round sound wound",
+    "bower cower dower lower mower power rower sower tower vower",
+    "eight fight light night",
+    "catch",
+    "match might",
+]
+
+
+@lru_cache(maxsize=None)
+def reference_depth(words):
+    """guesses needed in the worst case, guessing only from words"""
+    if len(words) <= 1:
+        return 1
+    best = float("inf")
+    for guess in words:
+        buckets = defaultdict(list)
+        for target in words:
+            buckets[feedback(guess, target)].append(target)
+        best = min(best, 1 + max(reference_depth(tuple(b)) for b in buckets.values()))
+    return best
+
+
+def expected(words, depth_left):
+    d = reference_depth(tuple(sorted(words)))
+    return d if d <= depth_left + 1 else float("inf")
+
+
+@pytest.fixture(autouse=True)
+def word_index():
+    # in memory: no feedback cache file for these few words
+    ws.use_word_index(WordIndex(WORDS, cache_dir=None))
+    yield
+    ws.min_depth_cache_clear()
+
+
+def key_of(words):
+    return ws.state_key(ws.state_of(words))
+
+
+def random_states(count, seed=0):
+    rng = random.Random(seed)
+    return [rng.sample(WORDS, rng.randint(2, 12)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("state", [s.split() for s in STATES] + random_states(20))
+@pytest.mark.parametrize("depth_left", [0, 1, 2, 3, 5])
+def test_matches_reference(state, depth_left):
+    ws.min_depth_cache_clear()
+    assert ws.min_depth(key_of(state), depth_left) == expected(state, depth_left)
+
+
+@pytest.mark.parametrize("order", [[0, 1, 2, 3, 5], [5, 3, 2, 1, 0], [1, 5, 0, 3, 2]])
+def test_cached_bounds_answer_every_depth(order):
+    # one cache across all queries: bounds stored by one depth_left
+    # must not change the answer at another
+    ws.min_depth_cache_clear()
+    for state in [s.split() for s in STATES] + random_states(10, seed=1):
+        for depth_left in order:
+            assert ws.min_depth(key_of(state), depth_left) == expected(state, depth_left)
@@ -0,0 +1,62 @@
+# partition_signature and distinct_guesses against partitions built
+# from feedback() strings
+
+import random
+from collections import defaultdict
+
+import pytest
+
+import wordle_solver as ws
+from feedback_matrix import WordIndex
+from wordle_solver import feedback
+
+
+WORDS = (
+    "batch catch hatch latch match patch ratch watch "
+    "bight fight light might night right sight tight wight eight "
+    "bound found hound mound pound round sound wound "
+    "abode crane slate pious vivid mamma"
+).split()
+
+
+def reference_partition(state, guess):
+    buckets = defaultdict(set)
+    for target in state:
+        buckets[feedback(guess, target)].add(target)
+    return frozenset(frozenset(b) for b in buckets.values())
+
+
+@pytest.fixture(autouse=True)
+def word_index():
+    # in memory: no feedback cache file for these few words
+    ws.use_word_index(WordIndex(WORDS, cache_dir=None))
+
+
+def random_states(count, seed=0):
+    rng = random.Random(seed)
+    return [rng.sample(WORDS, rng.randint(2, len(WORDS))) for _ in range(count)]
+
+
+@pytest.mark.parametrize("state", random_states(10))
+def test_equal_exactly_for_equal_partitions(state):
+    positions = ws.state_of(state)
+    for a in WORDS:
+        for b in WORDS:
+            same = reference_partition(state, a) == reference_partition(state, b)
+            signature_a = ws.partition_signature(positions, ws._word_index.position[a])
+            signature_b = ws.partition_signature(positions, ws._word_index.position[b])
+            assert (signature_a == signature_b) == same, (a, b)
+
+
+@pytest.mark.parametrize("state", random_states(10, seed=1))
+def test_distinct_guesses_keeps_first_of_each_partition(state):
+    positions = ws.state_of(state)
+    guesses = random.Random(2).sample(WORDS, len(WORDS))
+    seen = set()
+    expected = []
+    for guess in guesses:
+        partition = reference_partition(state, guess)
+        if partition not in seen:
+            seen.add(partition)
+            expected.append(guess)
+    assert ws.distinct_guesses(positions, guesses) == expected
@@ -0,0 +1,56 @@
+# SessionState.to_bytes / from_bytes round trips
+
+import struct
+
+import numpy as np
+import pytest
+
+from feedback_matrix import PATTERN_STRINGS
+from session_state import SessionState
+
+
+LIST_HASH = "0123456789abcdef"
+
+
+def round_trip(session):
+    return SessionState.from_bytes(session.to_bytes())
+
+
+def assert_same(a, b):
+    assert (a.list_hash, a.size, a.history) == (b.list_hash, b.size, b.history)
+    assert np.array_equal(a.state, b.state)
+
+
+@pytest.mark.parametrize("size", [1, 7, 8, 9, 4270])
+def test_full_and_empty_state(size):
+    assert_same(round_trip(SessionState(LIST_HASH, size)), SessionState(LIST_HASH, size))
+    empty = SessionState(LIST_HASH, size, [("abode", "BBBBB")], np.array([], dtype=np.intp))
+    back = round_trip(empty)
+    assert_same(back, empty)
+    assert len(back.state) == 0
+
+
+def test_255_turns():
+    rng = np.random.default_rng(0)
+    history = [("abode", PATTERN_STRINGS[c]) for c in rng.integers(0, 243, 255)]
+    state = np.sort(rng.choice(4270, 300, replace=False))
+    session = SessionState(LIST_HASH, 4270, history, state)
+    assert_same(round_trip(session), session)
+
+
+def test_played_keeps_earlier_turns():
+    session = SessionState(LIST_HASH, 50).played("abode", "BYBBG", np.array([3, 7]))
+    session = session.played("crane", "GGGGG", np.array([7]))
+    back = round_trip(session)
+    assert back.history == [("abode", "BYBBG"), ("crane", "GGGGG")]
+    assert back.state.tolist() == [7]
+
+
+def test_damaged_files_are_rejected():
+    data = SessionState(LIST_HASH, 100, [("abode", "BYBBB")], np.array([1, 2])).to_bytes()
+    with pytest.raises(struct.error):
+        SessionState.from_bytes(data[:7])
+    with pytest.raises(ValueError):
+        SessionState.from_bytes(data[:-1])
+    with pytest.raises(ValueError):
+        SessionState.from_bytes(b"X" + data[1:])
@@ -0,0 +1,105 @@
+# ResultsWriter / read_results files and simulation.py --resume
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from simulation import ResultsWriter, read_results
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+GAMES = [
+    ("cigar", 3, [("abode", 0.0), ("crust", 0.25), ("cigar", 0.125)]),
+    ("rebut", 7, [("abode", 0.0), ("tuber", 0.5)] + [("rebut", 1.0)] * 4),
+]
+
+
+def expected(target, attempts, turns):
+    return {
+        "target": target,
+        "attempts": attempts,
+        "guesses": [g for g, _ in turns],
+        "turn_seconds": [t for _, t in turns],
+    }
+
+
+@pytest.mark.parametrize("name", ["games.csv", "games.jsonl"])
+def test_round_trip(tmp_path, name):
+    path = str(tmp_path / name)
+    with ResultsWriter(path) as writer:
+        for game in GAMES:
+            writer.write(*game)
+    assert read_results(path) == {g[0]: expected(*g) for g in GAMES}
+
+
+def test_formats_by_extension(tmp_path):
+    csv_path, jsonl_path = str(tmp_path / "games.csv"), str(tmp_path / "games.jsonl")
+    for path in (csv_path, jsonl_path):
+        with ResultsWriter(path) as writer:
+            writer.write(*GAMES[0])
+    with open(csv_path) as f:
+        assert f.read().splitlines() == [
+            "target,attempts,guesses,turn_seconds",
+            "cigar,3,abode crust cigar,0.0 0.25 0.125",
+        ]
+    with open(jsonl_path) as f:
+        assert json.loads(f.read()) == expected(*GAMES[0])
+
+
+@pytest.mark.parametrize("name", ["games.csv", "games.jsonl"])
+def test_partial_last_line_is_dropped_before_appending(tmp_path, name):
+    path = str(tmp_path / name)
+    with ResultsWriter(path) as writer:
+        writer.write(*GAMES[0])
+    with open(path) as f:
+        complete = f.read()
+    # a crash mid-write, even mid-number
+    with open(path, "a") as f:
+        f.write("rebut,7,abode tu" if name.endswith(".csv") else '{"target": "rebut", "attempts": 7')
+    assert read_results(path) == {"cigar": expected(*GAMES[0])}
+
+    with ResultsWriter(path) as writer:
+        writer.write(*GAMES[1])
+    with open(path) as f:
+        assert f.read().startswith(complete)
+    assert read_results(path) == {g[0]: expected(*g) for g in GAMES}
+
+
+def test_broken_lines_are_skipped(tmp_path):
+    path = str(tmp_path / "games.csv")
+    with open(path, "w") as f:
+        f.write("target,attempts,guesses,turn_seconds\n"
+                "cigar,x,abode,0.0\n"
+                "rebut,2,abode rebut,0.0\n"
+                "sissy,2,abode sissy,0.0 0.5\n")
+    assert list(read_results(path)) == ["sissy"]
+    assert read_results(str(tmp_path / "missing.jsonl")) == {}
+
+
+def test_resume_skips_finished_targets(tmp_path):
+    from wordle_solver import load_words
+
+    first = load_words(os.path.join(ROOT, "words.txt"))[:3]
+    path = str(tmp_path / "games.jsonl")
+    # attempts no real game gives, so a replayed target would show
+    done = {"target": first[0], "attempts": 9, "guesses": ["abode"], "turn_seconds": [0.0]}
+    with open(path, "w") as f:
+        f.write(json.dumps(done) + "\n" + '{"target": "')
+
+    command = [
+        sys.executable, os.path.join(ROOT, "simulation.py"),
+        "--words-file", os.path.join(ROOT, "words.txt"), "--limit", "3", "--workers", "1",
+        "--results", path, "--output", str(tmp_path / "out.txt"),
+    ]
+    refused = subprocess.run(command, cwd=tmp_path, capture_output=True, text=True)
+    assert refused.returncode != 0 and "--resume" in refused.stderr
+
+    subprocess.run(command + ["--resume"], cwd=tmp_path, capture_output=True, check=True)
+    records = read_results(path)
+    assert list(records) == list(first)
+    assert records[first[0]] == done
+    assert all(r["guesses"][0] == "abode" and r["attempts"] <= 7 for r in list(records.values())[1:])
@@ -0,0 +1,130 @@
+# TranspositionTable eviction, policies and counters, and min_depth
+# under a tiny budget
+
+import random
+
+import pytest
+
+import wordle_solver as ws
+from feedback_matrix import WordIndex
+from transposition_table import ENTRY_BYTES, TranspositionTable
+
+
+def key(i):
+    return i.to_bytes(2, "little")
+
+
+# room for exactly n two-byte keys
+def budget(n):
+    return n * (ENTRY_BYTES + 2)
+
+
+def test_lru_evicts_least_recently_used():
+    table = TranspositionTable(budget(3))
+    for i in range(3):
+        table.put(key(i), i)
+    assert table.get(key(0)) == 0
+    table.put(key(3), 3)
+    assert key(1) not in table
+    assert [k in table for k in map(key, (0, 2, 3))] == [True, True, True]
+    assert table.nbytes == budget(3) and len(table) == 3
+
+
+def test_lru_ignores_priority():
+    table = TranspositionTable(budget(2))
+    table.put(key(0), 0, priority=9)
+    table.put(key(1), 1, priority=1)
+    table.put(key(2), 2, priority=5)
+    assert key(0) not in table and key(1) in table
+
+
+def test_depth_evicts_lowest_priority_first():
+    table = TranspositionTable(budget(3), policy="depth")
+    table.put(key(0), 0, priority=5)
+    table.put(key(1), 1, priority=2)
+    table.put(key(2), 2, priority=2)
+    table.get(key(1))
+    table.put(key(3), 3, priority=4)
+    # lowest priority goes first, least recently used among equals
+    assert key(2) not in table
+    table.put(key(4), 4, priority=3)
+    assert key(1) not in table
+    assert sorted(k for k in map(key, range(5)) if k in table) == [key(0), key(3), key(4)]
+
+
+def test_replacing_an_entry_moves_it():
+    table = TranspositionTable(budget(2), policy="depth")
+    table.put(key(0), "a", priority=1)
+    table.put(key(1), "b", priority=2)
+    table.put(key(0), "c", priority=3)
+    assert len(table) == 2 and table.nbytes == budget(2)
+    table.put(key(2), "d", priority=2)
+    assert key(1) not in table and table.get(key(0)) == "c"
+
+
+def test_counters():
+    table = TranspositionTable(budget(2))
+    table.put(key(0), 0)
+    table.get(key(0))
+    table.get(key(1))
+    table.get(key(1), "default")
+    table.put(key(1), 1)
+    table.put(key(2), 2)
+    stats = table.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 2, 1)
+    assert stats["peak_entries"] == 2 and stats["entries"] == 2
+    assert stats["hit_rate"] == pytest.approx(1 / 3)
+    table.clear()
+    assert table.stats()["hits"] == table.stats()["evictions"] == len(table) == 0
+
+
+def test_resize_evicts_down_to_the_new_budget():
+    table = TranspositionTable(budget(10))
+    for i in range(10):
+        table.put(key(i), i)
+    table.resize(budget(4))
+    assert [k for k in map(key, range(10)) if k in table] == list(map(key, range(6, 10)))
+    assert table.evictions == 6
+    table.resize(budget(100))
+    table.put(key(20), 20)
+    assert len(table) == 5
+
+
+def test_set_policy():
+    table = TranspositionTable(budget(4))
+    table.put(key(0), 0)
+    table.set_policy("lru")
+    assert key(0) in table
+    # a new policy starts over
+    table.set_policy("depth")
+    assert len(table) == 0 and table.policy == "depth"
+    with pytest.raises(ValueError):
+        table.set_policy("fifo")
+
+
+WORDS = (
+    "batch catch hatch latch match patch ratch watch "
+    "bight fight light might night right sight tight wight eight "
+    "bound found hound mound pound round sound wound "
+    "bower cower dower lower mower power rower sower tower vower"
+).split()
+
+
+@pytest.mark.parametrize("policy", ["lru", "depth"])
+def test_min_depth_answers_do_not_depend_on_the_budget(policy):
+    ws.use_word_index(WordIndex(WORDS, cache_dir=None))
+    rng = random.Random(0)
+    states = [ws.state_key(ws.state_of(rng.sample(WORDS, rng.randint(2, 14)))) for _ in range(30)]
+    queries = [(s, d) for s in states for d in (1, 2, 3, 5)]
+    try:
+        ws.min_depth_cache_resize(ws.MIN_DEPTH_CACHE_BYTES, policy)
+        ws.min_depth_cache_clear()
+        expected = [ws.min_depth(s, d) for s, d in queries]
+
+        ws.min_depth_cache_resize(3 * (ENTRY_BYTES + 8), policy)
+        ws.min_depth_cache_clear()
+        assert [ws.min_depth(s, d) for s, d in queries] == expected
+        assert ws.min_depth_cache_stats()["evictions"] > 0
+    finally:
+        ws.min_depth_cache_resize(ws.MIN_DEPTH_CACHE_BYTES, "lru")
+        ws.min_depth_cache_clear()
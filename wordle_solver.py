@@ -2,8 +2,30 @@
 # Provably Streak-Optimal Word Selector (Hard Mode, Minimax)
 # ============================================================
 
-from functools import lru_cache
+import atexit
+import importlib
+import os
+import time
+from array import array
 from collections import defaultdict
+from contextlib import contextmanager
+
+from feedback_matrix import (
+    PATTERN_COUNT,
+    PATTERN_STRINGS,
+    WordIndex,
+    compute_feedback_matrix,
+    guess_stats,
+    pattern_code,
+)
+from index_cache import load_word_file
+from lazy_import import lazy_import
+from opening_book import built_book_paths, load_book
+from search_stats import SearchStats
+from solver_store import DEFAULT_STORE_PATH, SolverStore
+from transposition_table import TranspositionTable
+
+np = lazy_import("numpy")
 
 
 # ------------------------------------------------------------
@@ -11,8 +33,44 @@ from collections import defaultdict
 # ------------------------------------------------------------
 
 def load_words(filename="words.txt"):
-    with open(filename) as f:
-        return tuple(w.strip() for w in f if len(w.strip()) == 5)
+    # words, matrix and letter masks come from the file's index cache
+    words, index = load_word_file(filename)
+    if _word_index is None or not _word_index.covers(words):
+        use_word_index(index)
+    return words
+
+# ------------------------------------------------------------
+# Active word index (feedback matrix shared by all solver calls)
+# ------------------------------------------------------------
+
+_word_index = None
+
+def use_word_list(words):
+    return use_word_index(WordIndex(words))
+
+def use_word_index(index):
+    global _word_index
+    _word_index = index
+    # cached states are positions in the index: they don't carry over
+    min_depth_cache.clear()
+    if _solver_store is not None:
+        _solver_store.rebind(_word_index.list_hash)
+    return _word_index
+
+def word_index_for(words):
+    # reuse the active index whenever it already knows every word
+    if _word_index is None or not _word_index.covers(words):
+        use_word_list(words)
+    return _word_index
+
+def feedback_row(guess, words):
+    """Pattern codes of guess against each word, as a list of ints."""
+    index = word_index_for(words)
+    g = index.position.get(guess)
+    idx = index.indices(words)
+    if g is None:
+        return compute_feedback_matrix(words, (guess,))[0].tolist()
+    return index.matrix[g, idx].tolist()
 
 # ------------------------------------------------------------
 # Wordle feedback (ASCII only)
@@ -44,14 +102,109 @@ def feedback(guess, target):
 
 def partition(words, guess):
     parts = defaultdict(list)
-    for w in words:
-        parts[feedback(guess, w)].append(w)
+    for code, w in zip(feedback_row(guess, words), words):
+        parts[code].append(w)
 
+    # codes sort in the same order as the pattern strings
     return tuple(
-        (pattern, tuple(subset))
-        for pattern, subset in sorted(parts.items())
+        (PATTERN_STRINGS[code], tuple(subset))
+        for code, subset in sorted(parts.items())
     )
 
+# ------------------------------------------------------------
+# Integer pattern code API
+# state : int array of positions in the active word index
+# guess : position of the guess word in the active word index
+# ------------------------------------------------------------
+
+def state_of(words):
+    index = word_index_for(words)
+    return np.array(index.indices(words), dtype=np.intp)
+
+def words_of(state):
+    words = _word_index.words
+    return tuple(words[i] for i in state.tolist())
+
+def bucket_sizes(state, guess):
+    return np.bincount(_word_index.matrix[guess, state], minlength=PATTERN_COUNT)
+
+def partition_codes(state, guess):
+    """
+    returns: ((code, members), ...) in code order, members keep
+    their order from state
+    """
+    codes = _word_index.matrix[guess, state]
+    sizes = np.bincount(codes, minlength=PATTERN_COUNT)
+    order = np.argsort(codes, kind="stable")
+    members = state[order]
+
+    present = np.flatnonzero(sizes)
+    ends = np.cumsum(sizes[present]).tolist()
+    starts = [0] + ends[:-1]
+    return tuple(zip(
+        present.tolist(),
+        (members[a:b] for a, b in zip(starts, ends))
+    ))
+
+def partition_signature(state, guess):
+    """
+    Equal for two guesses exactly when they split state into the same
+    buckets, whatever feedback codes the buckets get.
+    """
+    codes = _word_index.matrix[guess, state]
+    _, first, labels = np.unique(codes, return_index=True, return_inverse=True)
+    # number buckets by their first member
+    rank = np.empty(len(first), dtype=np.uint8)
+    rank[np.argsort(first)] = np.arange(len(first))
+    return rank[labels].tobytes()
+
+# guesses practically never tie on larger states, where the signatures
+# would cost more than the searches they save
+DEDUPE_MAX_WORDS = 64
+
+def distinct_guesses(state, guess_words):
+    """guess_words without those splitting state like an earlier one"""
+    if len(state) > DEDUPE_MAX_WORDS:
+        return list(guess_words)
+    position = _word_index.position
+    seen = set()
+    kept = []
+    for guess in guess_words:
+        signature = partition_signature(state, position[guess])
+        if signature not in seen:
+            seen.add(signature)
+            kept.append(guess)
+    return kept
+
+# ------------------------------------------------------------
+# Candidate state keys
+# A key is the sorted uint16 positions of a state as bytes: 2 bytes
+# per word, hashed once (bytes cache their hash) and compared with
+# memcmp, instead of rehashing a tuple of strings on every lookup.
+# ------------------------------------------------------------
+
+def state_key(state):
+    return np.sort(state).astype(np.uint16).tobytes()
+
+def key_words(key):
+    words = _word_index.words
+    return tuple(words[i] for i in memoryview(key).cast('H'))
+
+def filter_by_feedback(state, guess, code):
+    # only the bucket we need, none of the other 242
+    return state[_word_index.matrix[guess, state] == code]
+
+# string boundary: words consistent with feedback_string for guess
+def remaining_words(possible_words, guess, feedback_string):
+    state = state_of(possible_words)
+    code = pattern_code(feedback_string)
+    g = _word_index.position.get(guess)
+    if g is None:
+        # guess outside the word list: compute its row on the fly
+        keep = np.array(feedback_row(guess, possible_words)) == code
+        return words_of(state[keep])
+    return words_of(filter_by_feedback(state, g, code))
+
 # comput entropy given part lengths
 def compute_entropy(part_lengths, total_count):
     from math import log2
@@ -65,49 +218,36 @@ def compute_entropy(part_lengths, total_count):
 
 # sort words by entropy in descending order
 def sort_words_by_entropy(words):
-    total_count = len(words)
-    entropy_dict = {}
-    for w in words:       
-        part_lengths = defaultdict(int)
-        
-        for target in words:
-            part_lengths[feedback(w, target)] += 1
-        
-        entropy_dict[w] = compute_entropy(part_lengths, total_count)
-    return sorted(words, key=lambda w: entropy_dict[w], reverse=True)
+    ranking = _word_index.ranking
+    if ranking is not None and len(words) == len(_word_index) and tuple(words) == _word_index.words:
+        # the whole list: ranked when its index cache was built
+        return [words[i] for i in ranking.tolist()]
+
+    state = state_of(words)
+    entropy, _, _ = guess_stats(_word_index.matrix, state, state)
+
+    # stable, like sorted(..., reverse=True): ties keep their input order
+    order = np.argsort(-entropy, kind="stable")
+    return [words[i] for i in order.tolist()]
 
 # ------------------------------------------------------------
 # Guess word selection optimization
 # ------------------------------------------------------------
+
 def select_guess_words(words, depth_left):
     # choose only words with non-repeating letters as guess words
     if depth_left >= 4:
         guess_words = [w for w in words if len(set(w)) == 5]    
 
-        cnt= 0
-        selected_words = []
-
-        for gw in guess_words:       
-            part_lengths = defaultdict(int)
-            
-            for w in words:
-                part_lengths[feedback(gw, w)] += 1         
-            
-
-            # skip the guess word if part length count for patterns with certain black/yellow counts exceed thresholds
-            skip_guess_word = False
-            for pattern, count in part_lengths.items():
-                num_black = pattern.count('B')
-                num_yellow = pattern.count('Y')           
-                if (num_yellow == 0) and (num_black == 1) and count > 5:
-                    skip_guess_word = True
-                    # print("skipped guess word case 1", gw, pattern, count)
-                    break
-
-            if skip_guess_word is False:
-                cnt += 1
-                # print("kept guess word ", gw, cnt)
-                selected_words.append(gw)
+        state = state_of(words)
+
+        # skip the guess word if part length count for patterns with certain black/yellow counts exceed thresholds
+        _, _, risky = guess_stats(
+            _word_index.matrix, state_of(guess_words), state, risky_limit=5
+        )
+        selected_words = [
+            gw for gw, skip in zip(guess_words, risky.tolist()) if not skip
+        ]
         
         # 
         # if no words selected, fallback to all words
@@ -121,63 +261,372 @@ def select_guess_words(words, depth_left):
 # ------------------------------------------------------------
 # Minimax depth computation with caching
 # speed up min_depth. avoid string as much as possible
-@lru_cache(None)
+# ------------------------------------------------------------
+
+# memory budget for min_depth results; long simulations stay bounded
+MIN_DEPTH_CACHE_BYTES = 512 * 1024 * 1024
+
+min_depth_cache = TranspositionTable(MIN_DEPTH_CACHE_BYTES)
+
+def min_depth_cache_clear():
+    min_depth_cache.clear()
+
+def min_depth_cache_resize(max_bytes, policy=None):
+    if policy is not None:
+        min_depth_cache.set_policy(policy)
+    min_depth_cache.resize(max_bytes)
+
+def min_depth_cache_stats():
+    return min_depth_cache.stats()
+
+# min_depth(state, depth_left) is the state's true minimax depth when
+# that fits in depth_left + 1 guesses, and inf otherwise. The cache is
+# therefore keyed by state alone and holds (lower, upper) bounds on the
+# true depth: a finite result pins both, an inf result proves
+# lower = depth_left + 2. Any depth_left query the bounds decide is
+# answered without searching.
+#
+# state is a key from state_key()
 def min_depth(state, depth_left):
-    n = len(state)
+    bounds = min_depth_cache.get(state)
+    stored = _solver_store is not None and len(state) >= 2 * STORE_MIN_WORDS
+    if bounds is None and stored:
+        bounds = _solver_store.get_bounds(state)
+        if bounds is not None:
+            min_depth_cache.put(state, bounds, priority=bounds[0])
+            if _stats is not None:
+                _stats.store_hits += 1
+    if bounds is not None:
+        lower, upper = bounds
+        if lower == upper or lower > depth_left + 1:
+            if _stats is not None:
+                _stats.cache_hits += 1
+            if lower == upper:
+                return lower if lower <= depth_left + 1 else float("inf")
+            return float("inf")
+
+    if _stats is not None:
+        _stats.cache_misses += 1
+    d = _min_depth(state, depth_left)
+    if d == float("inf"):
+        bounds = (depth_left + 2, float("inf"))
+    else:
+        bounds = (d, d)
+    # priority only matters under the "depth" policy
+    min_depth_cache.put(state, bounds, priority=bounds[0])
+    if stored:
+        _solver_store.put_bounds(state, *bounds)
+    return d
+
+# ------------------------------------------------------------
+# Optional persistent store shared across processes
+# ------------------------------------------------------------
+
+# smaller states are cheaper to re-solve than to look up on disk
+STORE_MIN_WORDS = 20
+
+_solver_store = None
+
+def use_solver_store(path=DEFAULT_STORE_PATH):
+    global _solver_store
+    if _solver_store is not None:
+        _solver_store.close()
+    list_hash = _word_index.list_hash if _word_index is not None else None
+    _solver_store = SolverStore(list_hash, path)
+    atexit.register(_solver_store.flush)
+    return _solver_store
+
+# ------------------------------------------------------------
+# Admissible lower bounds
+# A guess from the state answers its own bucket in 1 and splits the
+# rest into at most 242 buckets, so k guesses cover at most
+# 1 + 242 * (what k - 1 guesses cover) candidates.
+# ------------------------------------------------------------
+
+def size_lower_bound(n):
+    depth, covered = 1, 1
+    while covered < n:
+        depth += 1
+        covered = 1 + (PATTERN_COUNT - 1) * covered
+    return depth
+
+def _min_depth(state, depth_left):
+    n = len(state) // 2
     if n <= 1:
         return 1
 
-    if depth_left == 0:
+    if depth_left <= 0:
         return float("inf")
 
-    best = float("inf")
+    if _search_deadline is not None and time.monotonic() > _search_deadline:
+        raise SearchTimeout
+
+    if _stats is not None:
+        _stats.nodes[depth_left] += 1
+
+    members = memoryview(state).cast('H').tolist()
+
+    # partition once per guess, for move ordering and bounds
+    options = []
+    for guess, row in zip(members, _word_index.rows(members)):
+        # small states: a plain loop over the byte row beats numpy
+        parts = {}
+        for i in members:
+            code = row[i]
+            subset = parts.get(code)
+            if subset is None:
+                parts[code] = [i]
+            else:
+                subset.append(i)
+
+        # singleton buckets are always solved in 1
+        buckets = [subset for subset in parts.values() if len(subset) > 1]
+        if not buckets:
+            # every bucket a singleton: 2 is the floor for n >= 2
+            if _stats is not None:
+                _stats.partitions += len(options) + 1
+                _stats.early_exits["all_singletons"] += 1
+            return 2
+        buckets.sort(key=len, reverse=True)
+        options.append((len(buckets[0]), -len(parts), buckets))
+
+    if _stats is not None:
+        _stats.partitions += len(options)
+
+    # strongest guesses first: smallest largest bucket, then most buckets
+    options.sort(key=lambda option: option[:2])
+
+    # best = depth_left + 2 stands for "nothing found within depth_left"
+    best = depth_left + 2
+    searched = set()
+    for largest, _, buckets in options:
+        # bound only grows along the ordering, so nothing later can win
+        if 1 + size_lower_bound(largest) >= best:
+            if _stats is not None:
+                _stats.prunes["bound"] += 1
+            break
+
+        # buckets are listed by first member, then stably by size, so
+        # guesses giving the same partition give the same signature and
+        # only the first of them is searched
+        signature = tuple(map(tuple, buckets))
+        if signature in searched:
+            if _stats is not None:
+                _stats.prunes["duplicate"] += 1
+            continue
+        searched.add(signature)
+
+        # to beat best every bucket must be solved in best - 2,
+        # i.e. min_depth(bucket, best - 3) must come back finite
+        limit = best - 3
+        worst = 1
+        for subset in buckets:
+            d = min_depth(array('H', subset).tobytes(), limit)
+            if d == float("inf"):
+                if _stats is not None:
+                    _stats.prunes["cutoff"] += 1
+                break
+            worst = max(worst, d)
+        else:
+            best = 1 + worst
 
-    for guess in state:
-        worst = 0
-        parts = partition(state, guess)
+    return best if best <= depth_left + 1 else float("inf")
 
-        for _, subset in parts:
-            d = min_depth(subset, depth_left - 1)
-            worst = max(worst, d)
 
-            # # prune branch
-            if worst >= best:
-                break
+# ------------------------------------------------------------
+# Optimal word selector (core result)
+# ------------------------------------------------------------
+
+def worst_case_depth(state, guess, depth_left, best_score=float("inf")):
+    """
+    Largest min_depth over the buckets guess splits state into, or inf
+    as soon as a bucket shows the guess cannot get under best_score.
+    Largest buckets are searched first, they are the likeliest to fail.
+    """
+    if _stats is not None:
+        _stats.guesses_evaluated += 1
+    if best_score <= 1:
+        if _stats is not None:
+            _stats.prunes["worst_case"] += 1
+        return float("inf")
+
+    limit = min(depth_left - 1, best_score - 2)
+    parts = sorted(
+        (subset for _, subset in partition_codes(state, guess)),
+        key=len, reverse=True
+    )
+    if _stats is not None:
+        _stats.partitions += 1
+
+    worst = 1
+    for subset in parts:
+        d = min_depth(state_key(subset), limit)
+        if d == float("inf"):
+            if _stats is not None:
+                _stats.prunes["worst_case"] += 1
+            return d
+        worst = max(worst, d)
+    return worst
 
-        score = 1 + worst
-        if score < best:
-            best = score
+# ------------------------------------------------------------
+# Opening books (see opening_book.py)
+# ------------------------------------------------------------
+
+_opening_books = []
+
+def use_opening_book(path):
+    book = load_book(path)
+    _opening_books.append(book)
+    return book
+
+def use_built_opening_books():
+    """Load every book opening_book.py has built into the cache dir."""
+    return [use_opening_book(path) for path in built_book_paths()]
+
+def book_answer(solver, state, depth_left):
+    if not _opening_books:
+        return None
+    version = solver_version(solver)
+    for book in _opening_books:
+        guess = book.lookup(solver, version, _word_index.list_hash, state, depth_left)
+        if guess is not None:
+            return guess
+    return None
+
+def solver_version(solver):
+    """SOLVER_VERSION of the solver module"""
+    return importlib.import_module(solver).SOLVER_VERSION
+
+def store_solver_name(solver):
+    # stored answers are kept per solver version
+    return f"{solver}@{solver_version(solver)}"
+
+# (answer, "book" or "store") from an opening book or the persistent
+# store, or (None, None) if neither has one
+def known_answer(solver, key, depth_left):
+    best_word = book_answer(solver, key, depth_left)
+    if best_word is not None:
+        return best_word, "book"
+    if _solver_store is not None:
+        best_word = _solver_store.get_answer(store_solver_name(solver), key, depth_left)
+        if best_word is not None:
+            return best_word, "store"
+    return None, None
+
+# a known answer counts as an early exit only where it is returned
+def _count_known(source):
+    if source is not None and _stats is not None:
+        _stats.early_exits[source] += 1
+
+# answer from an opening book or the persistent store when there is
+# one, else search
+def stored_answer(solver, words, depth_left, search):
+    if not _opening_books and _solver_store is None:
+        return search(words, depth_left)
+
+    key = state_key(state_of(words))
+    best_word, source = known_answer(solver, key, depth_left)
+    _count_known(source)
+    if best_word is None:
+        best_word = search(words, depth_left)
+        if best_word is not None and _solver_store is not None:
+            _solver_store.put_answer(store_solver_name(solver), key, depth_left, best_word)
+            _solver_store.flush()
+    return best_word
 
-            # solved next move, no need to explore
-            if best == 1:
-                return 1
+# ------------------------------------------------------------
+# Process pool workers
+# ------------------------------------------------------------
 
-    return best
+def worker_cache_bytes(workers=None):
+    """min_depth cache budget per worker, so a pool stays in one budget"""
+    return MIN_DEPTH_CACHE_BYTES // (workers or os.cpu_count() or 1)
 
+def attach_worker(words, shm_name, cache_bytes=None):
+    """
+    Pool initializer body: solve on the matrix in a block from
+    WordIndex.share(), with a min_depth cache of cache_bytes.
+    """
+    global _solver_store, _guess_pool
+    # a forked worker inherits these; it must not write through the
+    # parent's database connection or hand work to a pool of its own.
+    # Cleared first: use_word_index flushes the store it rebinds.
+    _solver_store = None
+    _guess_pool = None
+    if cache_bytes is not None:
+        min_depth_cache_resize(cache_bytes)
+    use_word_index(WordIndex.attach(words, shm_name))
 
 # ------------------------------------------------------------
-# Optimal word selector (core result)
+# Optional parallel guess evaluation (see guess_pool.py)
 # ------------------------------------------------------------
 
-def optimal_word(words, depth_left=6):
+_guess_pool = None
+
+def use_guess_pool(workers=None):
+    """Score optimal_word's candidate guesses on a process pool."""
+    from guess_pool import GuessPool
+
+    global _guess_pool
+    if _guess_pool is not None:
+        _guess_pool.close()
+    _guess_pool = GuessPool(_word_index, workers)
+    atexit.register(_guess_pool.close)
+    return _guess_pool
+
+MAX_GUESSES_TO_EVALUATE = 100
+
+# bump whenever a change to this module can change the guess
+# optimal_word picks (candidates, thresholds, early stops): stored
+# answers and opening books of other versions are then ignored
+SOLVER_VERSION = 1
+
+def optimal_word(words, depth_left=6, deadline=None, stats=None):
+    """
+    deadline: optional time.monotonic() value to answer by. With one,
+    returns (guess, proven) instead of the guess: the best guess found
+    in time, and whether it is proven optimal among the candidates.
+    stats   : optional SearchStats, filled in by the search
+    """
+    if stats is not None:
+        with collecting_stats(stats):
+            return optimal_word(words, depth_left, deadline)
+    if deadline is not None:
+        return anytime_word(words, depth_left, deadline)
+    return stored_answer("wordle_solver", words, depth_left, _optimal_word)
+
+def _optimal_word(words, depth_left):
     best_word = None
     best_score = float("inf")
 
-    MAX_GUESSES_TO_EVALUATE = 100
-
+    lap = time.perf_counter()
     words = sort_words_by_entropy(words)
+    lap = _charge("entropy_sort", lap)
     # using entropy to select guess words helps to speed up early stopping
     guess_words = select_guess_words(words, depth_left)    
     
     guess_words = guess_words[:MAX_GUESSES_TO_EVALUATE]
     # print("Number of guess words to evaluate:", len(guess_words))
-    for guess in guess_words:
+    state = state_of(words)
+    # equal partitions score equally and the first of equal scores is
+    # kept, so the rest need no search
+    guess_words = distinct_guesses(state, guess_words)
+    lap = _charge("guess_filter", lap)
+    position = _word_index.position
+    scores = None
+    if _guess_pool is not None and _guess_pool.list_hash == _word_index.list_hash:
+        # scores below the early-stopping score must be exact for the
+        # loop below to stop at the same guess
+        scores = _guess_pool.worst_case_depths(
+            state, [position[g] for g in guess_words], depth_left,
+            exact_below=5 if depth_left == 5 else 0,
+        )
+    for i, guess in enumerate(guess_words):
         # print(f"Evaluating guess: {guess}")
-        worst = 1
-        
-        for _, subset in partition(words, guess):
-            d = min_depth(subset, depth_left - 1)
-            worst = max(worst, d)
+        if scores is not None:
+            worst = scores[i]
+        else:
+            worst = worst_case_depth(state, position[guess], depth_left, best_score)
 
         if worst < best_score:
             best_score = worst     
@@ -187,62 +636,283 @@ def optimal_word(words, depth_left=6):
                
         # early stopping
         if depth_left == 5 and best_score == 4:
+           if _stats is not None:
+               _stats.early_exits["depth5_best4"] += 1
            break
         
         # print(f"Evaluating guess: {guess}", "Worst-case depth:", worst)
    
+    _charge("search", lap)
     return best_word
 
+# ------------------------------------------------------------
+# Opt-in search statistics (see search_stats.py)
+# ------------------------------------------------------------
+
+# the active collector; everything that counts checks for None first
+_stats = None
+
+@contextmanager
+def collecting_stats(stats):
+    global _stats
+    previous, _stats = _stats, stats
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.phases["total"] += time.perf_counter() - start
+        stats.peak_cache_entries = max(stats.peak_cache_entries, min_depth_cache.peak_entries)
+        stats.cache_bytes = min_depth_cache.nbytes
+        _stats = previous
+
+def _charge(phase, start):
+    """Time since start to phase, when collecting; returns the time now."""
+    now = time.perf_counter()
+    if _stats is not None:
+        _stats.phases[phase] += now - start
+    return now
+
+# ------------------------------------------------------------
+# Anytime search under a deadline
+# ------------------------------------------------------------
+
+class SearchTimeout(Exception):
+    pass
+
+# checked by _min_depth; set only while anytime_word runs
+_search_deadline = None
+
+def anytime_word(words, depth_left, deadline):
+    """
+    Iterative deepening over the target worst case: the first guess
+    shown to finish within target guesses, for target = 1, 2, ..., is
+    optimal among the candidates. Bounds proven by an interrupted level
+    stay cached, so each level restarts where the last one got to.
+
+    returns: (guess, proven); without a proof by the deadline, the
+    guess is a book or store answer if there is one, else the entropy
+    ranking's first candidate. (None, True) when the search finished
+    and no candidate is sure to win within depth_left.
+    """
+    # book and store answers come from the untimed search, which stops
+    # at depth 5 once a guess reaches 4: a fallback, not a proof
+    known, source = known_answer("wordle_solver", state_key(state_of(words)), depth_left)
+
+    lap = time.perf_counter()
+    words = sort_words_by_entropy(words)
+    lap = _charge("entropy_sort", lap)
+    guess_words = select_guess_words(words, depth_left)[:MAX_GUESSES_TO_EVALUATE]
+    if not guess_words:
+        _count_known(source)
+        return known, False
+    state = state_of(words)
+    guess_words = distinct_guesses(state, guess_words)
+    lap = _charge("guess_filter", lap)
+    position = _word_index.position
+
+    global _search_deadline
+    _search_deadline = deadline
+    try:
+        for target in range(1, depth_left + 1):
+            for guess in guess_words:
+                if time.monotonic() > deadline:
+                    raise SearchTimeout
+                if worst_case_depth(state, position[guess], depth_left, target + 1) <= target:
+                    return guess, True
+        # every level searched: nothing fits in depth_left
+        return None, True
+    except SearchTimeout:
+        if _stats is not None:
+            _stats.early_exits["deadline"] += 1
+    finally:
+        _search_deadline = None
+        _charge("search", lap)
+    if known is None:
+        return guess_words[0], False
+    _count_known(source)
+    return known, False
+
 def optimal_guess_from_feedback(
     possible_words,
     previous_guess,
     feedback_string,
-    depth_left
+    depth_left,
+    stats=None
 ):
     """
     possible_words   : tuple of remaining candidate words
     previous_guess   : the word that was just guessed
     feedback_string  : Wordle feedback (e.g. 'BGYBB')
     depth_left       : remaining guesses (e.g. 5 after first guess)
+    stats            : optional SearchStats, see optimal_word
 
     returns: streak-optimal next guess
     """
 
     # Choose minimax-optimal next word
      # Update candidate set using feedback
-    parts = dict(partition(possible_words, previous_guess))
-    new_possible = parts[feedback_string]
-    next_guess = optimal_word(new_possible, depth_left)
+    new_possible = remaining_words(possible_words, previous_guess, feedback_string)
+    next_guess = optimal_word(new_possible, depth_left, stats=stats)
     
     return next_guess, new_possible
 
+# ------------------------------------------------------------
+# Batch queries: one search per distinct state
+# ------------------------------------------------------------
+
+def replay(history):
+    """
+    history: [(guess, feedback_string), ...] played from the full list
+    returns: state after it (empty if no word matches)
+    """
+    # mask intersections on the letter index, not a matrix row per turn
+    return _word_index.constraints.filter(history)
+
+def _solve_state(args):
+    solver, key, depth_left = args
+    return importlib.import_module(solver).optimal_word(key_words(key), depth_left)
+
+def solve_batch(histories, solver="wordle_solver", workers=None):
+    """
+    histories: one [(guess, feedback_string), ...] per game, with
+    depth_left = 6 - len(history) as in the CLI
+    workers  : solve the distinct states on a process pool this size
+
+    returns: next guess per history, in order; None where no word
+    matches the history
+    """
+    keys = []
+    unique = {}
+    for history in histories:
+        state = replay(history)
+        if len(state) == 0:
+            keys.append(None)
+            continue
+        key = (state_key(state), 6 - len(history))
+        unique.setdefault(key, None)
+        keys.append(key)
+
+    tasks = [(solver, key, depth_left) for key, depth_left in unique]
+    if workers and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        shm = _word_index.share()
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=attach_worker,
+                initargs=(_word_index.words, shm.name, worker_cache_bytes(workers)),
+            ) as pool:
+                answers = list(pool.map(_solve_state, tasks))
+        finally:
+            shm.close()
+            shm.unlink()
+    else:
+        answers = [_solve_state(task) for task in tasks]
+
+    unique = dict(zip(unique, answers))
+    return [None if key is None else unique[key] for key in keys]
+
 
 # ------------------------------------------------------------
 # Main
 # ------------------------------------------------------------
 
 if __name__ == "__main__":
-    words = load_words("words.txt")   
+    import argparse
 
-    import sys
-    if (len(sys.argv) != 4):
-        print("Usage: python wordle_solver.py <prev_guess> <feedback> <number of attemps so far>")
-        print(" Recommended to run after using the first guess word as 'abode' in wordle")
-        sys.exit(1)  
-    if len(sys.argv) == 4:       
-        possible = words 
-        guess = sys.argv[1]
-        fb = sys.argv[2] 
-        depth_left = 6 - int(sys.argv[3])
-
-    # get new guess and new possible
-    new_guess, new_possible = optimal_guess_from_feedback(
-            possible_words=possible,
-            previous_guess= guess,
-            feedback_string=fb,
-            depth_left = depth_left)
-    print("next optimal guess:", new_guess)
+    from constraint_index import parse_history
+
+    parser = argparse.ArgumentParser(
+        usage="python wordle_solver.py <prev_guess> <feedback> <number of attemps so far>"
+        "\n       python wordle_solver.py --history abode:BGYBB,cairn:GGBBY",
+        epilog="Recommended to run after using the first guess word as 'abode' in wordle",
+    )
+    parser.add_argument("prev_guess", nargs="?")
+    parser.add_argument("feedback", nargs="?", help="e.g. BGYBB")
+    parser.add_argument("attempts", type=int, nargs="?", help="number of attempts so far")
+    parser.add_argument(
+        "--history", metavar="GUESS:FEEDBACK,...",
+        help="the whole game so far, e.g. abode:BGYBB,cairn:GGBBY,"
+        " in place of the three arguments",
+    )
+    parser.add_argument(
+        "--store", nargs="?", const=DEFAULT_STORE_PATH, default=None,
+        help="reuse solved states from an on-disk cache shared by all runs"
+        f" (default path: {DEFAULT_STORE_PATH})",
+    )
+    parser.add_argument(
+        "--workers", type=int, nargs="?", const=0, default=None,
+        help="evaluate candidate guesses on a process pool"
+        " (default size: one worker per CPU)",
+    )
+    parser.add_argument(
+        "--book",
+        help="opening book to consult first (default: every book built"
+        " by opening_book.py)",
+    )
+    parser.add_argument(
+        "--time-budget", type=float, metavar="SECONDS",
+        help="answer within this many seconds with the best guess found,"
+        " even if it is not proven optimal",
+    )
+    parser.add_argument(
+        "--stats", action="store_true",
+        help="print search statistics (nodes, cache hits, prunes, timings)",
+    )
+    args = parser.parse_args()
+    if args.history:
+        if args.prev_guess is not None:
+            parser.error("give either --history or prev_guess, feedback and attempts")
+        try:
+            history = parse_history(args.history)
+        except ValueError as e:
+            parser.error(str(e))
+    elif args.attempts is None:
+        parser.error("give prev_guess, feedback and attempts, or --history")
+    deadline = None
+    if args.time_budget is not None:
+        deadline = time.monotonic() + args.time_budget
+
+    words = load_words("words.txt")   
+    if args.store:
+        use_solver_store(args.store)
+    if args.workers is not None:
+        use_guess_pool(args.workers or None)
+    if args.book:
+        use_opening_book(args.book)
+    else:
+        use_built_opening_books()
+
+    possible = words 
+    guess = args.prev_guess
+    fb = args.feedback
+    depth_left = 6 - args.attempts if not args.history else 6 - len(history)
+    if args.history:
+        # earlier turns narrow the list, the last one is played below
+        possible = words_of(replay(history[:-1]))
+        guess, fb = history[-1]
+    stats = SearchStats() if args.stats else None
+
+    if deadline is not None:
+        new_possible = remaining_words(possible, guess, fb)
+        new_guess, proven = optimal_word(new_possible, depth_left, deadline, stats=stats)
+        if new_guess is None:
+            print("next guess: None (no candidate guess is sure to win in the guesses left)")
+        else:
+            print("next guess:", new_guess, "(proven optimal)" if proven else "(best found within the time budget)")
+    else:
+        # get new guess and new possible
+        new_guess, new_possible = optimal_guess_from_feedback(
+                possible_words=possible,
+                previous_guess= guess,
+                feedback_string=fb,
+                depth_left = depth_left,
+                stats=stats)
+        print("next optimal guess:", new_guess)
     print("remaining possible words:", new_possible)
+    if stats is not None:
+        print(stats.report())
 
 
    
\ No newline at end of file
@@ -2,112 +2,65 @@
 # Provably Streak-Optimal Word Selector (Hard Mode, Minimax)
 # ============================================================
 
-from functools import lru_cache
-from collections import defaultdict
-
-
-# ------------------------------------------------------------
-# Load word list
-# ------------------------------------------------------------
-
-def load_words(filename="words.txt"):
-    with open(filename) as f:
-        return tuple(w.strip() for w in f if len(w.strip()) == 5)
-
-# ------------------------------------------------------------
-# Wordle feedback (ASCII only)
-# G = green, Y = yellow, B = black
-# ------------------------------------------------------------
-
-def feedback(guess, target):
-    res = ['B'] * 5
-    cnt = defaultdict(int)
-
-    # Greens
-    for i in range(5):
-        if guess[i] == target[i]:
-            res[i] = 'G'
-        else:
-            cnt[target[i]] += 1
-
-    # Yellows
-    for i in range(5):
-        if res[i] == 'B' and cnt[guess[i]] > 0:
-            res[i] = 'Y'
-            cnt[guess[i]] -= 1
-
-    return ''.join(res)
-
-# ------------------------------------------------------------
-# Partition candidate set by feedback
-# ------------------------------------------------------------
-
-def partition(words, guess):
-    parts = defaultdict(list)
-    for w in words:
-        parts[feedback(guess, w)].append(w)
-
-    return tuple(
-        (pattern, tuple(subset))
-        for pattern, subset in sorted(parts.items())
-    )
-
-# ------------------------------------------------------------
-# Minimax depth computation with caching
-# speed up min_depth. avoid string as much as possible
-@lru_cache(None)
-def min_depth(state, depth_left):
-    n = len(state)
-    if n <= 1:
-        return 1
-
-    if depth_left == 0:
-        return float("inf")
-
-    best = float("inf")
-
-    for guess in state:
-        worst = 0
-        parts = partition(state, guess)
-
-        for _, subset in parts:
-            d = min_depth(subset, depth_left - 1)
-            worst = max(worst, d)
-
-            # # prune branch
-            if worst >= best:
-                break
-
-        score = 1 + worst
-        if score < best:
-            best = score
-
-            # solved next move, no need to explore
-            if best == 1:
-                return 1
-
-    return best
+import time
+
+# word loading, feedback, partitioning and min_depth are shared with
+# wordle_solver.py so both entry points use the same feedback matrix
+from wordle_solver import (
+    DEDUPE_MAX_WORDS,
+    DEFAULT_STORE_PATH,
+    feedback,
+    load_words,
+    partition_signature,
+    remaining_words,
+    replay,
+    state_of,
+    stored_answer,
+    use_built_opening_books,
+    use_opening_book,
+    use_solver_store,
+    word_index_for,
+    words_of,
+    worst_case_depth,
+)
+from session_state import DEFAULT_SESSION_PATH, SessionState, load_session
 
 
 # ------------------------------------------------------------
 # Optimal word selector (core result)
 # ------------------------------------------------------------
 
+# bump whenever a change here can change the guess optimal_word picks,
+# so stored answers and opening books from before are not served
+SOLVER_VERSION = 1
+
 def optimal_word(words, depth_left=6):
+    return stored_answer("wordle_solver_new", words, depth_left, _optimal_word)
+
+def _optimal_word(words, depth_left):
     best_word = None
     best_score = float("inf")
 
     # Evaluate each candidate word as a guess
 
     guess_cnt  = 0
+    state = state_of(words)
+    position = word_index_for(words).position
+    dedupe = len(state) <= DEDUPE_MAX_WORDS
+    seen = set()
     for guess in words:
         guess_cnt += 1
         # print(f"Evaluating guess: {guess}")
-        worst = 1
-
-        for _, subset in partition(words, guess):
-            d = min_depth(subset, depth_left - 1)
-            worst = max(worst, d)
+        duplicate = False
+        if dedupe:
+            signature = partition_signature(state, position[guess])
+            duplicate = signature in seen
+            seen.add(signature)
+        if duplicate:
+            # same buckets as an earlier guess: cannot beat its score
+            worst = float("inf")
+        else:
+            worst = worst_case_depth(state, position[guess], depth_left, best_score)
 
         # breakpoint()
 
@@ -139,18 +92,23 @@ def optimal_guess_from_feedback(
 
     # Choose minimax-optimal next word
      # Update candidate set using feedback
-    parts = dict(partition(possible_words, previous_guess))
-    new_possible = parts[feedback_string]
+    new_possible = remaining_words(possible_words, previous_guess, feedback_string)
     print("new possible words count:", len(new_possible))
     next_guess = optimal_word(new_possible, depth_left)
     
     return next_guess, new_possible
 
 # simulate single game
-def simulate_single_game(target_word, first_guess="abode"):
-    possible = load_words("words.txt")
+def simulate_single_game(target_word, first_guess="abode", words=None, turns=None):
+    """
+    turns: optional list, appended (guess, solver seconds) for every
+    guess played, the opener with 0 seconds
+    """
+    possible = load_words("words.txt") if words is None else words
     guess = first_guess
     depth_left = 6
+    if turns is not None:
+        turns.append((guess, 0.0))
 
     while depth_left > 0:
         fb = feedback(guess, target_word)    
@@ -160,12 +118,19 @@ def simulate_single_game(target_word, first_guess="abode"):
             print(f"Solved! The word is {guess}", "num attempts:", 7 - depth_left)
             return 7 - depth_left
         
+        start = time.perf_counter()
         guess, possible = optimal_guess_from_feedback(
         possible_words=possible,
         previous_guess= guess,
         feedback_string=fb,
         depth_left = depth_left)            
         depth_left -= 1
+        if guess is None:
+            # no guess is sure to win in the guesses left
+            break
+        if turns is not None and depth_left > 0:
+            # the guess chosen with one left is never played
+            turns.append((guess, time.perf_counter() - start))
         # print(f"Next guess: {guess}, Feedback: {fb}, Remaining possible words: {len(possible)}")
 
     print(f"Failed to solve for target word {target_word}")
@@ -178,15 +143,16 @@ def simulate_game(first_guess="abode"):
     results = {}
 
     words = load_words("words.txt")
-    for target_word in words:
-        # print(f"Simulating game for target word: {target_word}")
-        attempts = simulate_single_game(target_word, first_guess)
-        results[target_word] = attempts
-
-    # save results to a text file
+    # save results to a text file as each game ends, so a crash keeps
+    # the games already played (simulation.py --results can resume)
     with open("simulation_results.txt", "w") as f:
-        for word, attempts in results.items():
-            f.write(f"{word}: {attempts}\n")
+        for target_word in words:
+            # print(f"Simulating game for target word: {target_word}")
+            attempts = simulate_single_game(target_word, first_guess, words)
+            results[target_word] = attempts
+            f.write(f"{target_word}: {attempts}\n")
+            f.flush()
+    return results
 
 
 # ------------------------------------------------------------
@@ -196,22 +162,90 @@ def simulate_game(first_guess="abode"):
 if __name__ == "__main__":
     # simulate_game()
     # simulate_single_game("cairn")
+    import argparse
+    import struct
     import sys
-    if (len(sys.argv) != 4):
-        print("Usage: python wordle_solver.py <prev_guess> <feedback> <number of attemps so far>")
-        print(" Recommended to run after using the first guess word as 'abode' in wordle")
-        sys.exit(1)  
-    if len(sys.argv) == 4:       
-        guess = sys.argv[1]
-        fb = sys.argv[2] 
-        depth_left = 6 - int(sys.argv[3])
-
-        if depth_left == 5:
-            # use words.txt
-            possible = load_words("words.txt")
-        else:
-            # load possible words from previous round
-            possible = load_words("possible_words.txt")
+
+    from constraint_index import parse_history
+
+    parser = argparse.ArgumentParser(
+        usage="python wordle_solver_new.py <prev_guess> <feedback> <number of attemps so far>"
+        "\n       python wordle_solver_new.py --history abode:BGYBB,cairn:GGBBY",
+        epilog="Recommended to run after using the first guess word as 'abode' in wordle",
+    )
+    parser.add_argument("prev_guess", nargs="?")
+    parser.add_argument("feedback", nargs="?", help="e.g. BGYBB")
+    parser.add_argument("attempts", type=int, nargs="?", help="number of attempts so far")
+    parser.add_argument(
+        "--history", metavar="GUESS:FEEDBACK,...",
+        help="the whole game so far, e.g. abode:BGYBB,cairn:GGBBY,"
+        " in place of the three arguments; no session file is read or written",
+    )
+    parser.add_argument(
+        "--store", nargs="?", const=DEFAULT_STORE_PATH, default=None,
+        help="reuse solved states from an on-disk cache shared by all runs"
+        f" (default path: {DEFAULT_STORE_PATH})",
+    )
+    parser.add_argument(
+        "--book",
+        help="opening book to consult first (default: every book built"
+        " by opening_book.py)",
+    )
+    parser.add_argument(
+        "--session", default=DEFAULT_SESSION_PATH,
+        help="file keeping this game's state between turns; use one per"
+        f" concurrent game (default: {DEFAULT_SESSION_PATH})",
+    )
+    args = parser.parse_args()
+    history = None
+    if args.history:
+        if args.prev_guess is not None:
+            parser.error("give either --history or prev_guess, feedback and attempts")
+        try:
+            history = parse_history(args.history)
+        except ValueError as e:
+            parser.error(str(e))
+        # earlier turns narrow the list, the last one is played below
+        guess, fb = history[-1]
+        depth_left = 6 - len(history)
+    elif args.attempts is None:
+        parser.error("give prev_guess, feedback and attempts, or --history")
+    else:
+        guess = args.prev_guess
+        fb = args.feedback
+        depth_left = 6 - args.attempts
+
+    # always index the full list, so stored states mean the same thing
+    # whichever turn wrote them
+    words = load_words("words.txt")
+    if args.store:
+        use_solver_store(args.store)
+    if args.book:
+        use_opening_book(args.book)
+    else:
+        use_built_opening_books()
+
+    index = word_index_for(words)
+    if history is not None:
+        session = SessionState(index.list_hash, len(index), history[:-1], replay(history[:-1]))
+    elif depth_left == 5:
+        # use words.txt
+        session = SessionState(index.list_hash, len(index))
+    else:
+        # load this game's candidates from the previous round
+        try:
+            session = load_session(args.session, index)
+        except FileNotFoundError:
+            print(f"No saved session in {args.session}. Start with attempts = 1.")
+            sys.exit(1)
+        except (ValueError, struct.error) as e:
+            print(f"Cannot read {args.session}: {e}. Start with attempts = 1.")
+            sys.exit(1)
+        if len(session.history) != args.attempts - 1:
+            print(f"{args.session} holds {len(session.history)} turns, expected"
+                  f" {args.attempts - 1}. Please check your inputs.")
+            sys.exit(1)
+    possible = words_of(session.state)
 
     if len(possible) == 0:
         print("No possible words remaining. Please check your inputs.")
@@ -228,7 +262,6 @@ if __name__ == "__main__":
             depth_left = depth_left)
     print("next optimal guess:", new_guess)
     # print("remaining possible words:", new_possible)
-    # save new possible for next round as a text file
-    with open("possible_words.txt", "w") as f:
-        for w in new_possible:
-            f.write(w + "\n")
\ No newline at end of file
+    # save this round for the next one
+    if history is None:
+        session.played(guess, fb, state_of(new_possible)).save(args.session)
\ No newline at end of file